@@ -1,12 +1,10 @@
-from abc import ABC, abstractmethod
-
-class ASTNode(ABC):
-    """Abstract base class for all AST nodes"""
+class ASTNode:
+    """Base class for all AST nodes"""
+    __slots__ = ()
     
-    @abstractmethod
     def accept(self, visitor):
         """Accept a visitor (Visitor Pattern)"""
-        pass
+        raise NotImplementedError(f"{type(self).__name__} does not implement accept()")
     
     def __repr__(self):
         return f"{self.__class__.__name__}()"
@@ -15,14 +13,14 @@ class ASTNode(ABC):
 # ============ EXPRESSIONS ============
 class Expression(ASTNode):
     """Base class for all expressions"""
-    @abstractmethod
-    def accept(self, visitor):
-        pass
+    __slots__ = ()
 
 
 
 class Literal(Expression):
     """Literal value (int, float, string)"""
+    __slots__ = ('value', 'type_name')
+    
     def __init__(self, value, type_name="Literal"):
         self.value = value
         self.type_name = type_name
@@ -34,22 +32,54 @@ class Literal(Expression):
          return f"{self.type_name}Literal({self.value})"
 
 class IntegerLiteral(Literal):
-    """Integer literal"""
-    def __init__(self, value):
-        super().__init__(value, "Integer")
+    """Integer literal.
+    
+    Small values are interned like CPython's small ints: IntegerLiteral(1)
+    always returns the same node, so literal nodes must not be mutated.
+    """
+    __slots__ = ()
+    
+    def __new__(cls, value):
+        if type(value) is int and _INT_MIN <= value <= _INT_MAX:
+            return _INT_CACHE[value - _INT_MIN]
+        node = object.__new__(cls)
+        node.value = value
+        node.type_name = "Integer"
+        return node
+    
+    # __new__ fills the slots, so construction makes no second Python
+    # call (object.__init__ accepts the argument because __new__ is
+    # overridden)
+    __init__ = object.__init__
+
+_INT_MIN, _INT_MAX = -128, 256
+_INT_CACHE = []
+for _value in range(_INT_MIN, _INT_MAX + 1):
+    _node = object.__new__(IntegerLiteral)
+    Literal.__init__(_node, _value, "Integer")
+    _INT_CACHE.append(_node)
+del _value, _node
 
 class FloatLiteral(Literal):
     """Float literal"""
+    __slots__ = ()
+    
     def __init__(self, value):
-        super().__init__(value, "Float")
+        self.value = value
+        self.type_name = "Float"
 
 class StringLiteral(Literal):
     """String literal"""
+    __slots__ = ()
+    
     def __init__(self, value):
-        super().__init__(value, "String")
+        self.value = value
+        self.type_name = "String"
 
 class Identifier(Expression):
     """Variable identifier"""
+    __slots__ = ('name',)
+    
     def __init__(self, name):
         self.name = name
     
@@ -61,6 +91,8 @@ class Identifier(Expression):
 
 class BinaryOp(Expression):
     """Binary operation (e.g., a + b)"""
+    __slots__ = ('left', 'op', 'right')
+    
     def __init__(self, left, op, right):
         self.left = left
         self.op = op
@@ -74,6 +106,8 @@ class BinaryOp(Expression):
 
 class UnaryOp(Expression):
     """Unary operation (e.g., -x)"""
+    __slots__ = ('op', 'expr')
+    
     def __init__(self, op, expr):
         self.op = op
         self.expr = expr
@@ -86,6 +120,8 @@ class UnaryOp(Expression):
 
 class CallExpression(Expression):
     """Function call"""
+    __slots__ = ('func_name', 'arguments')
+    
     def __init__(self, func_name, arguments):
         self.func_name = func_name
         self.arguments = arguments  
@@ -101,24 +137,73 @@ class CallExpression(Expression):
 
 class Statement(ASTNode):
     """Base class for all statements"""
-    @abstractmethod
-    def accept(self, visitor):
-        pass
+    __slots__ = ()
 
 class Program(Statement):
     """Root node: contains list of statements"""
+    __slots__ = ('statements', '_flat', '_by_type')
+    
     def __init__(self, statements):
         self.statements = statements
+        self._flat = None
+        self._by_type = None
     
     def accept(self, visitor):
         return visitor.visit_program(self)
     
+    def flatten(self):
+        """Return all nodes of the tree in post-order (cached).
+        
+        The first call walks the tree once; later passes reuse the list,
+        or the per-class lists from nodes_of(). A node object reachable
+        through several parents is listed once, at its first post-order
+        position. A pass that replaces or reassigns children must call
+        invalidate() afterwards.
+        """
+        if self._flat is None:
+            order = []
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                order.append(node)
+                for field in CHILD_FIELDS[type(node)]:
+                    child = getattr(node, field)
+                    if child is None:
+                        continue
+                    if type(child) is list:
+                        stack.extend(child)
+                    else:
+                        stack.append(child)
+            order.reverse()
+            # Keep the first occurrence of each shared node
+            order = list({id(node): node for node in order}.values())
+            
+            by_type = {}
+            for node in order:
+                by_type.setdefault(type(node), []).append(node)
+            self._flat = order
+            self._by_type = by_type
+        return self._flat
+    
+    def nodes_of(self, cls):
+        """Return all nodes of exactly class cls, in post-order"""
+        if self._flat is None:
+            self.flatten()
+        return self._by_type.get(cls, [])
+    
+    def invalidate(self):
+        """Drop the cached traversal after the tree was mutated"""
+        self._flat = None
+        self._by_type = None
+    
     def __repr__(self):
         stmts = '\n  '.join(str(stmt) for stmt in self.statements)
         return f"Program([\n  {stmts}\n])"
 
 class VarDeclaration(Statement):
     """Variable declaration: var x = 10;"""
+    __slots__ = ('var_name', 'value')
+    
     def __init__(self, var_name, value):
         self.var_name = var_name
         self.value = value
@@ -131,6 +216,8 @@ class VarDeclaration(Statement):
 
 class Assignment(Statement):
     """Assignment: x = 10;"""
+    __slots__ = ('var_name', 'value')
+    
     def __init__(self, var_name, value):
         self.var_name = var_name
         self.value = value 
@@ -143,6 +230,8 @@ class Assignment(Statement):
 
 class Block(Statement):
     """Block of statements: { stmt1; stmt2; }"""
+    __slots__ = ('statements',)
+    
     def __init__(self, statements):
         self.statements = statements
     
@@ -155,6 +244,8 @@ class Block(Statement):
 
 class IfStatement(Statement):
     """If statement: if (condition) { ... } else { ... }"""
+    __slots__ = ('condition', 'then_block', 'else_block')
+    
     def __init__(self, condition, then_block, else_block=None):
         self.condition = condition
         self.then_block = then_block  
@@ -169,6 +260,8 @@ class IfStatement(Statement):
 
 class WhileStatement(Statement):
     """While loop: while (condition) { ... }"""
+    __slots__ = ('condition', 'body')
+    
     def __init__(self, condition, body):
         self.condition = condition  
         self.body = body 
@@ -181,6 +274,8 @@ class WhileStatement(Statement):
 
 class FunctionDeclaration(Statement):
     """Function declaration: def func(x, y) { ... }"""
+    __slots__ = ('func_name', 'params', 'body')
+    
     def __init__(self, func_name, params, body):
         self.func_name = func_name
         self.params = params
@@ -195,6 +290,8 @@ class FunctionDeclaration(Statement):
 
 class ReturnStatement(Statement):
     """Return statement: return value;"""
+    __slots__ = ('value',)
+    
     def __init__(self, value):
         self.value = value
     
@@ -206,6 +303,8 @@ class ReturnStatement(Statement):
 
 class ExpressionStatement(Statement):
     """Expression as statement: x + 5;"""
+    __slots__ = ('expression',)
+    
     def __init__(self, expression):
         self.expression = expression
     
@@ -213,4 +312,26 @@ class ExpressionStatement(Statement):
         return visitor.visit_expression_statement(self)
     
     def __repr__(self):
-        return f"ExpressionStatement({self.expression})"
\ No newline at end of file
+        return f"ExpressionStatement({self.expression})"
+
+
+# Node class -> child fields, in source order
+CHILD_FIELDS = {
+    Program: ('statements',),
+    VarDeclaration: ('value',),
+    Assignment: ('value',),
+    IfStatement: ('condition', 'then_block', 'else_block'),
+    WhileStatement: ('condition', 'body'),
+    FunctionDeclaration: ('body',),
+    ReturnStatement: ('value',),
+    ExpressionStatement: ('expression',),
+    Block: ('statements',),
+    BinaryOp: ('left', 'right'),
+    UnaryOp: ('expr',),
+    CallExpression: ('arguments',),
+    Identifier: (),
+    Literal: (),
+    IntegerLiteral: (),
+    FloatLiteral: (),
+    StringLiteral: (),
+}
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""Struct-of-arrays AST representation.
+
+ASTArena keeps nodes of the same kind in parallel array('i') columns
+(e.g. binop_left / binop_op / binop_right) instead of one Python object
+per node. A node handle is an int index into the arena's kind/slot
+arrays. Lists (statements, arguments, parameters) are contiguous runs in
+the shared `items` array, names and string literals are interned in
+`strings`, and numeric literal values live in `literals`.
+
+Nodes are added bottom-up, so every child handle is smaller than its
+parent's and a sequential pass over the handles sees children first.
+"""
+from array import array
+from enum import IntEnum
+
+from ast import *
+
+
+class NodeKind(IntEnum):
+    PROGRAM = 0
+    BLOCK = 1
+    VAR_DECL = 2
+    ASSIGN = 3
+    IF = 4
+    WHILE = 5
+    FUNC = 6
+    RETURN = 7
+    EXPR_STMT = 8
+    BINOP = 9
+    UNARY = 10
+    CALL = 11
+    IDENT = 12
+    INT = 13
+    FLOAT = 14
+    STRING = 15
+
+
+OPERATORS = ('+', '-', '*', '/', '==', '!=', '<', '>', '<=', '>=', '&&', '||')
+OP_CODES = {op: i for i, op in enumerate(OPERATORS)}
+
+# Column names per kind. Node fields are handles (-1 for a missing else
+# block), names/strings are indices into `strings`, numbers are indices
+# into `literals`, and *_start/*_count describe a run in `items`.
+LAYOUT = {
+    NodeKind.PROGRAM: ('stmt_start', 'stmt_count'),
+    NodeKind.BLOCK: ('stmt_start', 'stmt_count'),
+    NodeKind.VAR_DECL: ('name', 'value'),
+    NodeKind.ASSIGN: ('name', 'value'),
+    NodeKind.IF: ('condition', 'then_block', 'else_block'),
+    NodeKind.WHILE: ('condition', 'body'),
+    NodeKind.FUNC: ('name', 'param_start', 'param_count', 'body'),
+    NodeKind.RETURN: ('value',),
+    NodeKind.EXPR_STMT: ('expression',),
+    NodeKind.BINOP: ('left', 'op', 'right'),
+    NodeKind.UNARY: ('op', 'expr'),
+    NodeKind.CALL: ('name', 'arg_start', 'arg_count'),
+    NodeKind.IDENT: ('name',),
+    NodeKind.INT: ('value',),
+    NodeKind.FLOAT: ('value',),
+    NodeKind.STRING: ('value',),
+}
+
+
+class ASTArena:
+    """All nodes of one program, stored column-wise"""
+
+    def __init__(self):
+        self.kind = array('b')   # handle -> NodeKind
+        self.slot = array('i')   # handle -> row in that kind's columns
+        self.items = array('i')  # runs of handles / string indices
+        self.strings = []
+        self.literals = []
+        self.root = -1
+        self._string_ids = {}
+        self.columns = {}
+        for kind, fields in LAYOUT.items():
+            columns = tuple(array('i') for _ in fields)
+            self.columns[kind] = columns
+            prefix = kind.name.lower()
+            for field, column in zip(fields, columns):
+                setattr(self, f"{prefix}_{field}", column)
+
+    def __len__(self):
+        return len(self.kind)
+
+    # ============ BUILDING ============
+
+    def add(self, kind, *values):
+        """Append a node and return its handle"""
+        columns = self.columns[kind]
+        self.kind.append(kind)
+        self.slot.append(len(columns[0]))
+        for column, value in zip(columns, values):
+            column.append(value)
+        return len(self.kind) - 1
+
+    def add_items(self, values):
+        """Store a run of ints in `items`; return (start, count)"""
+        start = len(self.items)
+        self.items.extend(values)
+        return start, len(self.items) - start
+
+    def intern(self, text):
+        """Return the index of text in `strings`"""
+        index = self._string_ids.get(text)
+        if index is None:
+            index = self._string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+    def add_literal(self, value):
+        self.literals.append(value)
+        return len(self.literals) - 1
+
+    @classmethod
+    def from_program(cls, program: Program):
+        """Convert an object AST into an arena"""
+        arena = cls()
+        handles = {}
+        for node in program.flatten():
+            handles[id(node)] = arena._add_node(node, handles)
+        arena.root = handles[id(program)]
+        return arena
+
+    def _add_node(self, node, handles):
+        cls = type(node)
+        if cls is BinaryOp:
+            return self.add(NodeKind.BINOP, handles[id(node.left)],
+                            OP_CODES[node.op], handles[id(node.right)])
+        if cls is Identifier:
+            return self.add(NodeKind.IDENT, self.intern(node.name))
+        if cls is IntegerLiteral:
+            return self.add(NodeKind.INT, self.add_literal(node.value))
+        if cls is FloatLiteral:
+            return self.add(NodeKind.FLOAT, self.add_literal(node.value))
+        if cls is StringLiteral:
+            return self.add(NodeKind.STRING, self.intern(node.value))
+        if cls is UnaryOp:
+            return self.add(NodeKind.UNARY, OP_CODES[node.op], handles[id(node.expr)])
+        if cls is CallExpression:
+            start, count = self.add_items(handles[id(arg)] for arg in node.arguments)
+            return self.add(NodeKind.CALL, self.intern(node.func_name), start, count)
+        if cls is Program or cls is Block:
+            start, count = self.add_items(handles[id(stmt)] for stmt in node.statements)
+            kind = NodeKind.PROGRAM if cls is Program else NodeKind.BLOCK
+            return self.add(kind, start, count)
+        if cls is VarDeclaration or cls is Assignment:
+            kind = NodeKind.VAR_DECL if cls is VarDeclaration else NodeKind.ASSIGN
+            return self.add(kind, self.intern(node.var_name), handles[id(node.value)])
+        if cls is IfStatement:
+            else_block = handles[id(node.else_block)] if node.else_block else -1
+            return self.add(NodeKind.IF, handles[id(node.condition)],
+                            handles[id(node.then_block)], else_block)
+        if cls is WhileStatement:
+            return self.add(NodeKind.WHILE, handles[id(node.condition)], handles[id(node.body)])
+        if cls is FunctionDeclaration:
+            start, count = self.add_items(self.intern(param) for param in node.params)
+            return self.add(NodeKind.FUNC, self.intern(node.func_name), start, count,
+                            handles[id(node.body)])
+        if cls is ReturnStatement:
+            return self.add(NodeKind.RETURN, handles[id(node.value)])
+        if cls is ExpressionStatement:
+            return self.add(NodeKind.EXPR_STMT, handles[id(node.expression)])
+        raise TypeError(f"Cannot store {cls.__name__} in an ASTArena")
+
+    # ============ READING ============
+
+    def field(self, handle, name):
+        """Raw column value of one node"""
+        kind = self.kind[handle]
+        return self.columns[kind][LAYOUT[kind].index(name)][self.slot[handle]]
+
+    def to_tree(self):
+        """Rebuild the object AST (for visitors that dispatch on node class)"""
+        strings = self.strings
+        literals = self.literals
+        items = self.items
+        nodes = [None] * len(self.kind)
+        for handle, (kind, slot) in enumerate(zip(self.kind, self.slot)):
+            c = [column[slot] for column in self.columns[kind]]
+            if kind == NodeKind.BINOP:
+                node = BinaryOp(nodes[c[0]], OPERATORS[c[1]], nodes[c[2]])
+            elif kind == NodeKind.IDENT:
+                node = Identifier(strings[c[0]])
+            elif kind == NodeKind.INT:
+                node = IntegerLiteral(literals[c[0]])
+            elif kind == NodeKind.FLOAT:
+                node = FloatLiteral(literals[c[0]])
+            elif kind == NodeKind.STRING:
+                node = StringLiteral(strings[c[0]])
+            elif kind == NodeKind.UNARY:
+                node = UnaryOp(OPERATORS[c[0]], nodes[c[1]])
+            elif kind == NodeKind.CALL:
+                args = [nodes[h] for h in items[c[1]:c[1] + c[2]]]
+                node = CallExpression(strings[c[0]], args)
+            elif kind == NodeKind.PROGRAM:
+                node = Program([nodes[h] for h in items[c[0]:c[0] + c[1]]])
+            elif kind == NodeKind.BLOCK:
+                node = Block([nodes[h] for h in items[c[0]:c[0] + c[1]]])
+            elif kind == NodeKind.VAR_DECL:
+                node = VarDeclaration(strings[c[0]], nodes[c[1]])
+            elif kind == NodeKind.ASSIGN:
+                node = Assignment(strings[c[0]], nodes[c[1]])
+            elif kind == NodeKind.IF:
+                else_block = nodes[c[2]] if c[2] >= 0 else None
+                node = IfStatement(nodes[c[0]], nodes[c[1]], else_block)
+            elif kind == NodeKind.WHILE:
+                node = WhileStatement(nodes[c[0]], nodes[c[1]])
+            elif kind == NodeKind.FUNC:
+                params = [strings[i] for i in items[c[1]:c[1] + c[2]]]
+                node = FunctionDeclaration(strings[c[0]], params, nodes[c[3]])
+            elif kind == NodeKind.RETURN:
+                node = ReturnStatement(nodes[c[0]])
+            else:
+                node = ExpressionStatement(nodes[c[0]])
+            nodes[handle] = node
+        return nodes[self.root]
@@ -0,0 +1,272 @@
+"""Lower an AST to compact bytecode.
+
+Every instruction is one opcode byte, followed by a 2-byte little-endian
+operand for the opcodes in HAS_ARG. Jump operands are signed offsets
+relative to the end of the jump instruction.
+
+Names at program level are globals, resolved at compile time to slots in
+a table shared by the whole program. Inside a function, parameters and
+`var` declarations are locals; every other name falls back to a global
+(there are no closures). Undefined globals such as `print` are looked up
+among the VM's builtins at run time.
+"""
+from enum import IntEnum
+
+from ast import *
+from visitor import ASTVisitor
+
+
+class OpCode(IntEnum):
+    CONST = 1          # CONST i: push consts[i]
+    LOAD = 2           # LOAD i: push locals[i]
+    STORE = 3          # STORE i: locals[i] = pop()
+    LOAD_GLOBAL = 4    # LOAD_GLOBAL i: push globals[i]
+    STORE_GLOBAL = 5   # STORE_GLOBAL i: globals[i] = pop()
+    ADD = 6
+    SUB = 7
+    MUL = 8
+    DIV = 9
+    EQ = 10
+    NEQ = 11
+    LT = 12
+    GT = 13
+    LTE = 14
+    GTE = 15
+    AND = 16           # both operands are evaluated
+    OR = 17
+    NEG = 18
+    JMP = 19           # JMP off: ip += off
+    JZ = 20            # JZ off: if not pop(): ip += off
+    CALL = 21          # CALL n: pop n args and the callee, push result
+    RET = 22
+    POP = 23
+
+
+HAS_ARG = frozenset({
+    OpCode.CONST, OpCode.LOAD, OpCode.STORE, OpCode.LOAD_GLOBAL,
+    OpCode.STORE_GLOBAL, OpCode.JMP, OpCode.JZ, OpCode.CALL,
+})
+
+BINARY_OPS = {
+    '+': OpCode.ADD,
+    '-': OpCode.SUB,
+    '*': OpCode.MUL,
+    '/': OpCode.DIV,
+    '==': OpCode.EQ,
+    '!=': OpCode.NEQ,
+    '<': OpCode.LT,
+    '>': OpCode.GT,
+    '<=': OpCode.LTE,
+    '>=': OpCode.GTE,
+    '&&': OpCode.AND,
+    '||': OpCode.OR,
+}
+
+
+class CodeObject:
+    """Compiled program or function body"""
+    __slots__ = ('name', 'code', 'consts', 'nparams', 'nlocals', 'global_names')
+
+    def __init__(self, name, code, consts, nparams, nlocals, global_names):
+        self.name = name
+        self.code = code
+        self.consts = consts
+        self.nparams = nparams
+        self.nlocals = nlocals
+        self.global_names = global_names
+
+    def __repr__(self):
+        return f"CodeObject({self.name}, {len(self.code)} bytes)"
+
+
+class Compiler(ASTVisitor):
+    """Visitor that emits bytecode for one program or function body"""
+
+    def __init__(self, name="<program>", params=(), globals=None):
+        super().__init__()
+        self.name = name
+        self.code = bytearray()
+        self.consts = []
+        self._const_index = {}
+        # Shared name -> slot table for the whole program
+        self.globals = globals if globals is not None else {}
+        # None at program level, where every name is global
+        self.locals = None if globals is None else {p: i for i, p in enumerate(params)}
+        self.nparams = len(params)
+
+    # ============ EMITTING ============
+
+    def emit(self, op, arg=None):
+        self.code.append(op)
+        if arg is not None:
+            self.code += arg.to_bytes(2, 'little', signed=op in (OpCode.JMP, OpCode.JZ))
+
+    def emit_jump(self, op):
+        """Emit a forward jump; returns the operand offset to patch"""
+        self.emit(op, 0)
+        return len(self.code) - 2
+
+    def patch_jump(self, operand):
+        """Point a forward jump at the current end of code"""
+        offset = len(self.code) - (operand + 2)
+        self.code[operand:operand + 2] = offset.to_bytes(2, 'little', signed=True)
+
+    def emit_loop(self, target):
+        """Emit a backward JMP to target"""
+        self.emit(OpCode.JMP, target - (len(self.code) + 3))
+
+    def add_const(self, value):
+        if isinstance(value, CodeObject):
+            self.consts.append(value)
+            return len(self.consts) - 1
+        # Keyed by type so that 1, 1.0 and True stay distinct
+        key = (type(value), value)
+        index = self._const_index.get(key)
+        if index is None:
+            index = self._const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return index
+
+    def global_slot(self, name):
+        slot = self.globals.get(name)
+        if slot is None:
+            slot = self.globals[name] = len(self.globals)
+        return slot
+
+    def emit_load(self, name):
+        if self.locals is not None and name in self.locals:
+            self.emit(OpCode.LOAD, self.locals[name])
+        else:
+            self.emit(OpCode.LOAD_GLOBAL, self.global_slot(name))
+
+    def emit_store(self, name, declare=False):
+        if self.locals is not None and (declare or name in self.locals):
+            slot = self.locals.setdefault(name, len(self.locals))
+            self.emit(OpCode.STORE, slot)
+        else:
+            self.emit(OpCode.STORE_GLOBAL, self.global_slot(name))
+
+    def finish(self) -> CodeObject:
+        """Close the body with an implicit `return None`"""
+        self.emit(OpCode.CONST, self.add_const(None))
+        self.emit(OpCode.RET)
+        nlocals = len(self.locals) if self.locals is not None else 0
+        global_names = list(self.globals)
+        return CodeObject(self.name, bytes(self.code), tuple(self.consts),
+                          self.nparams, nlocals, global_names)
+
+    # ============ STATEMENTS ============
+
+    def visit_program(self, node: Program):
+        for stmt in node.statements:
+            self._DISPATCH[type(stmt)](self, stmt)
+
+    def visit_var_declaration(self, node: VarDeclaration):
+        self._DISPATCH[type(node.value)](self, node.value)
+        self.emit_store(node.var_name, declare=True)
+
+    def visit_assignment(self, node: Assignment):
+        self._DISPATCH[type(node.value)](self, node.value)
+        self.emit_store(node.var_name)
+
+    def visit_if_statement(self, node: IfStatement):
+        self._DISPATCH[type(node.condition)](self, node.condition)
+        to_else = self.emit_jump(OpCode.JZ)
+        self._DISPATCH[type(node.then_block)](self, node.then_block)
+        if node.else_block:
+            to_end = self.emit_jump(OpCode.JMP)
+            self.patch_jump(to_else)
+            self._DISPATCH[type(node.else_block)](self, node.else_block)
+            self.patch_jump(to_end)
+        else:
+            self.patch_jump(to_else)
+
+    def visit_while_statement(self, node: WhileStatement):
+        top = len(self.code)
+        self._DISPATCH[type(node.condition)](self, node.condition)
+        to_end = self.emit_jump(OpCode.JZ)
+        self._DISPATCH[type(node.body)](self, node.body)
+        self.emit_loop(top)
+        self.patch_jump(to_end)
+
+    def visit_function_declaration(self, node: FunctionDeclaration):
+        compiler = Compiler(node.func_name, node.params, self.globals)
+        compiler.visit(node.body)
+        self.emit(OpCode.CONST, self.add_const(compiler.finish()))
+        self.emit_store(node.func_name, declare=True)
+
+    def visit_return_statement(self, node: ReturnStatement):
+        self._DISPATCH[type(node.value)](self, node.value)
+        self.emit(OpCode.RET)
+
+    def visit_expression_statement(self, node: ExpressionStatement):
+        self._DISPATCH[type(node.expression)](self, node.expression)
+        self.emit(OpCode.POP)
+
+    def visit_block(self, node: Block):
+        for stmt in node.statements:
+            self._DISPATCH[type(stmt)](self, stmt)
+
+    # ============ EXPRESSIONS ============
+
+    def visit_binary_op(self, node: BinaryOp):
+        self._DISPATCH[type(node.left)](self, node.left)
+        self._DISPATCH[type(node.right)](self, node.right)
+        self.emit(BINARY_OPS[node.op])
+
+    def visit_unary_op(self, node: UnaryOp):
+        self._DISPATCH[type(node.expr)](self, node.expr)
+        if node.op == '-':
+            self.emit(OpCode.NEG)
+
+    def visit_call_expression(self, node: CallExpression):
+        self.emit_load(node.func_name)
+        for arg in node.arguments:
+            self._DISPATCH[type(arg)](self, arg)
+        self.emit(OpCode.CALL, len(node.arguments))
+
+    def visit_identifier(self, node: Identifier):
+        self.emit_load(node.name)
+
+    def visit_literal(self, node: Literal):
+        self.emit(OpCode.CONST, self.add_const(node.value))
+
+
+def compile_program(program: Program) -> CodeObject:
+    """Compile a whole program to its top-level code object"""
+    compiler = Compiler()
+    compiler.visit(program)
+    return compiler.finish()
+
+
+def disassemble(code_object: CodeObject) -> str:
+    """Human-readable listing of a code object and its nested functions"""
+    lines = [f"{code_object.name}:"]
+    code = code_object.code
+    functions = []
+    ip = 0
+    while ip < len(code):
+        op = OpCode(code[ip])
+        if op in HAS_ARG:
+            signed = op in (OpCode.JMP, OpCode.JZ)
+            arg = int.from_bytes(code[ip + 1:ip + 3], 'little', signed=signed)
+            if op == OpCode.CONST:
+                value = code_object.consts[arg]
+                if isinstance(value, CodeObject):
+                    functions.append(value)
+                note = f"({value!r})"
+            elif op in (OpCode.LOAD_GLOBAL, OpCode.STORE_GLOBAL):
+                note = f"({code_object.global_names[arg]})"
+            elif signed:
+                note = f"(to {ip + 3 + arg})"
+            else:
+                note = ""
+            lines.append(f"  {ip:4}  {op.name:<12} {arg} {note}".rstrip())
+            ip += 3
+        else:
+            lines.append(f"  {ip:4}  {op.name}")
+            ip += 1
+    for function in functions:
+        lines.append("")
+        lines.append(disassemble(function))
+    return "\n".join(lines)
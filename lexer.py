@@ -1,46 +1,53 @@
-class TokenType:
+import re
+from bisect import bisect_left
+from enum import IntEnum
+
+
+class TokenType(IntEnum):
     # Keywords
-    VAR = 'VAR'
-    DEF = 'DEF'
-    IF = 'IF'
-    ELSE = 'ELSE'
-    WHILE = 'WHILE'
-    RETURN = 'RETURN'
+    VAR = 1
+    DEF = 2
+    IF = 3
+    ELSE = 4
+    WHILE = 5
+    RETURN = 6
     
     # Identifiers and literals
-    ID = 'ID'
-    INT = 'INT'
-    FLOAT = 'FLOAT'
-    STRING = 'STRING'
+    ID = 7
+    INT = 8
+    FLOAT = 9
+    STRING = 10
     
     # Operators
-    PLUS = 'PLUS'
-    MINUS = 'MINUS'
-    MULTIPLY = 'MULTIPLY'
-    DIVIDE = 'DIVIDE'
-    ASSIGN = 'ASSIGN'
-    EQ = 'EQ'           # ==
-    NEQ = 'NEQ'         # !=
-    LT = 'LT'           # <
-    GT = 'GT'           # >
+    PLUS = 11
+    MINUS = 12
+    MULTIPLY = 13
+    DIVIDE = 14
+    ASSIGN = 15
+    EQ = 16       # ==
+    NEQ = 17      # !=
+    LT = 18       # <
+    GT = 19       # >
     
     # Delimiters
-    LPAREN = 'LPAREN'   # (
-    RPAREN = 'RPAREN'   # )
-    LBRACE = 'LBRACE'   # {
-    RBRACE = 'RBRACE'   # }
-    SEMI = 'SEMI'       # ;
-    COMMA = 'COMMA'     # ,
+    LPAREN = 20   # (
+    RPAREN = 21   # )
+    LBRACE = 22   # {
+    RBRACE = 23   # }
+    SEMI = 24     # ;
+    COMMA = 25    # ,
 
-    AND = 'AND'           # &&
-    OR = 'OR'             # ||
-    LTE = 'LTE'           # <=
-    GTE = 'GTE'   
+    AND = 26      # &&
+    OR = 27       # ||
+    LTE = 28      # <=
+    GTE = 29      # >=
     # Special
-    EOF = 'EOF'
+    EOF = 30
 
 
 class Token:
+    __slots__ = ('type', 'value', 'line', 'column')
+    
     def __init__(self, type, value, line, column):
         self.type = type
         self.value = value
@@ -48,214 +55,179 @@ class Token:
         self.column = column
     
     def __repr__(self):
-        return f"Token({self.type}, '{self.value}', line={self.line}, col={self.column})"
+        return f"Token({self.type.name}, '{self.value}', line={self.line}, col={self.column})"
     
 
+class LexerError(Exception):
+    """Raised by Lexer.error() for input that cannot be tokenized"""
+
+
+# Whitespace and comments, skipped as a prefix of every token match.
+# A comment always runs to the end of its line; the lookahead stops the
+# engine from backtracking into it and starting a token mid-comment.
+_TRIVIA = r'[ \t\r\n]*(?:\#[^\n]*(?![^\n])[ \t\r\n]*)*'
+_TRIVIA_RE = re.compile(_TRIVIA)
+
+# Master pattern: leading trivia, then one named group per token class,
+# tried in order. Longer operators must come before their one-character
+# prefixes. Operators share the MULTI and SINGLE groups and are
+# classified by the _MULTI and _SINGLE tables.
+TOKEN_RE = re.compile(_TRIVIA + r"""(?:
+      (?P<FLOAT>\d+\.\d*)
+    | (?P<INT>\d+)
+    | (?P<STRING>"[^"]*")
+    | (?P<ID>[^\W\d]\w*)
+    | (?P<MULTI>==|!=|<=|>=|&&|\|\|)
+    | (?P<SINGLE>[-+*/(){};,=<>])
+)""", re.VERBOSE)
+
+# Token type of each two-character operator
+_MULTI = {
+    '==': TokenType.EQ,
+    '!=': TokenType.NEQ,
+    '<=': TokenType.LTE,
+    '>=': TokenType.GTE,
+    '&&': TokenType.AND,
+    '||': TokenType.OR,
+}
+
+# Token type of each single-character operator, indexed by code point
+_SINGLE = [None] * 128
+for _char, _type in {
+    '=': TokenType.ASSIGN,
+    '<': TokenType.LT,
+    '>': TokenType.GT,
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.MULTIPLY,
+    '/': TokenType.DIVIDE,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    ';': TokenType.SEMI,
+    ',': TokenType.COMMA,
+}.items():
+    _SINGLE[ord(_char)] = _type
+del _char, _type
+
+_KEYWORDS = {
+    'var': TokenType.VAR,
+    'def': TokenType.DEF,
+    'if': TokenType.IF,
+    'else': TokenType.ELSE,
+    'while': TokenType.WHILE,
+    'return': TokenType.RETURN
+}
+
+
+def _newline_offsets(text, start=0, end=None):
+    """Sorted offsets of the newlines in text[start:end]"""
+    offsets = []
+    pos = text.find('\n', start, end)
+    while pos != -1:
+        offsets.append(pos)
+        pos = text.find('\n', pos + 1, end)
+    return offsets
+
+
 class Lexer:
     def __init__(self, text):
         self.text = text
         self.pos = 0
         self.line = 1
         self.column = 1
-        self.current_char = self.text[0] if self.text else None
+        self._newlines = None  # built by _pos_of() on first use
+        self._iter = self._scan()
+    
+    def _pos_of(self, offset):
+        """1-based (line, column) of a character offset"""
+        newlines = self._newlines
+        if newlines is None:
+            newlines = self._newlines = _newline_offsets(self.text)
+        index = bisect_left(newlines, offset)
+        return index + 1, offset - (newlines[index - 1] if index else -1)
     
     def error(self, message):
-        raise Exception(f"Lexer error at line {self.line}, column {self.column}: {message}")
+        raise LexerError(f"Lexer error at line {self.line}, column {self.column}: {message}")
     
-    def advance(self):
-        """Move to next character"""
-        if self.current_char == '\n':
-            self.line += 1
-            self.column = 0
+    def _spans(self, pos=0):
+        """Generate (start, end, token) for every token from offset pos on.
         
-        self.pos += 1
-        if self.pos < len(self.text):
-            self.current_char = self.text[self.pos]
-            self.column += 1
+        Once the text is exhausted, trailing trivia is skipped and anything
+        left is reported through error(); self.pos, self.line and
+        self.column are left at the end of the input.
+        """
+        text = self.text
+        if pos:
+            line, column = self._pos_of(pos)
+            line_start = pos - column + 1
         else:
-            self.current_char = None
-    
-    def peek(self):
-        """Look ahead one character"""
-        peek_pos = self.pos + 1
-        if peek_pos < len(self.text):
-            return self.text[peek_pos]
-        return None
-    
-    def skip_whitespace(self):
-        """Skip spaces, tabs, newlines"""
-        while self.current_char and self.current_char in ' \t\r\n':
-            self.advance()
-    
-    def skip_comment(self):
-        """Skip single-line comments (# ...)"""
-        while self.current_char and self.current_char != '\n':
-            self.advance()
-        self.advance() 
-    
-    def number(self):
-        """Read a number (int or float)"""
-        result = ''
-        start_col = self.column
-        
-        while self.current_char and self.current_char.isdigit():
-            result += self.current_char
-            self.advance()
+            line, line_start = 1, 0  # offset of the current line's first character
         
-        if self.current_char == '.':
-            result += self.current_char
-            self.advance()
-            while self.current_char and self.current_char.isdigit():
-                result += self.current_char
-                self.advance()
-            return Token(TokenType.FLOAT, float(result), self.line, start_col)
-        
-        return Token(TokenType.INT, int(result), self.line, start_col)
-    
-    def string(self):
-        """Read a string literal"""
-        start_col = self.column
-        self.advance() 
-        result = ''
-        
-        while self.current_char and self.current_char != '"':
-            result += self.current_char
-            self.advance()
+        for m in iter(TOKEN_RE.scanner(text, pos).match, None):
+            kind = m.lastgroup
+            skipped = m.start()
+            start, pos = m.span(kind)
+            if skipped != start:
+                newlines = text.count('\n', skipped, start)
+                if newlines:
+                    line += newlines
+                    line_start = text.rindex('\n', skipped, start) + 1
+            column = start - line_start + 1
+            
+            if kind == 'STRING':
+                # Slice the body straight out of the text, without quotes
+                yield start, pos, Token(TokenType.STRING, text[start + 1:pos - 1], line, column)
+                # Strings may span lines
+                newlines = text.count('\n', start, pos)
+                if newlines:
+                    line += newlines
+                    line_start = text.rindex('\n', start, pos) + 1
+                continue
+            
+            lexeme = text[start:pos]
+            if kind == 'SINGLE':
+                yield start, pos, Token(_SINGLE[ord(lexeme)], lexeme, line, column)
+            elif kind == 'ID':
+                yield start, pos, Token(_KEYWORDS.get(lexeme, TokenType.ID), lexeme, line, column)
+            elif kind == 'INT':
+                yield start, pos, Token(TokenType.INT, int(lexeme), line, column)
+            elif kind == 'FLOAT':
+                yield start, pos, Token(TokenType.FLOAT, float(lexeme), line, column)
+            else:
+                yield start, pos, Token(_MULTI[lexeme], lexeme, line, column)
         
-        if not self.current_char:
-            self.error("Unterminated string")
+        # Step over trailing trivia; anything left is a bad character
+        pos = _TRIVIA_RE.match(text, pos).end()
+        self.pos = pos
+        self.line, self.column = self._pos_of(pos)
         
-        self.advance() 
-        return Token(TokenType.STRING, result, self.line, start_col)
+        if pos < len(text):
+            if text[pos] == '"':
+                self.error("Unterminated string")
+            self.error(f"Unexpected character: {text[pos]}")
     
-    def identifier(self):
-        """Read an identifier or keyword"""
-        result = ''
-        start_col = self.column
+    def _scan(self):
+        """Generate the tokens of the whole text, then EOF forever"""
+        for _, _, token in self._spans():
+            yield token
         
-        while self.current_char and (self.current_char.isalnum() or self.current_char == '_'):
-            result += self.current_char
-            self.advance()
-        
-        keywords = {
-            'var': TokenType.VAR,
-            'def': TokenType.DEF,
-            'if': TokenType.IF,
-            'else': TokenType.ELSE,
-            'while': TokenType.WHILE,
-            'return': TokenType.RETURN
-        }
-        
-        token_type = keywords.get(result, TokenType.ID)
-        return Token(token_type, result, self.line, start_col)
+        eof = Token(TokenType.EOF, None, self.line, self.column)
+        while True:
+            yield eof
     
     def get_next_token(self):
         """Main method to get next token"""
-        while self.current_char:
-            if self.current_char in ' \t\r\n':
-                self.skip_whitespace()
-                continue
-            
-            if self.current_char == '#':
-                self.skip_comment()
-                continue
-            
-            if self.current_char.isdigit():
-                return self.number()
-            
-            if self.current_char == '"':
-                return self.string()
-            
-            if self.current_char.isalpha() or self.current_char == '_':
-                return self.identifier()
-            
-            start_col = self.column
-            char = self.current_char
-            
-            if char == '=':
-                self.advance()
-                if self.current_char == '=':
-                    self.advance()
-                    return Token(TokenType.EQ, '==', self.line, start_col)
-                return Token(TokenType.ASSIGN, '=', self.line, start_col)
-            
-            if char == '!':
-                self.advance()
-                if self.current_char == '=':
-                    self.advance()
-                    return Token(TokenType.NEQ, '!=', self.line, start_col)
-                self.error(f"Unexpected character: {char}")
-            
-
-            if char == '<':
-                self.advance()
-                if self.current_char == '=':
-                    self.advance()
-                    return Token(TokenType.LTE, '<=', self.line, start_col)
-                return Token(TokenType.LT, '<', self.line, start_col)
-
-            if char == '>':
-                self.advance()
-                if self.current_char == '=':
-                    self.advance()
-                    return Token(TokenType.GTE, '>=', self.line, start_col)
-                return Token(TokenType.GT, '>', self.line, start_col)
-            
-            if char == '&':
-                self.advance()
-                if self.current_char == '&':
-                    self.advance()
-                    return Token(TokenType.AND, '&&', self.line, start_col)
-                self.error(f"Unexpected character: {char}")
-
-            if char == '|':
-                self.advance()
-                if self.current_char == '|':
-                    self.advance()
-                    return Token(TokenType.OR, '||', self.line, start_col)
-                self.error(f"Unexpected character: {char}")
-
-            if char == '<':
-                self.advance()
-                if self.current_char == '=':
-                    self.advance()
-                    return Token(TokenType.LTE, '<=', self.line, start_col)
-                return Token(TokenType.LT, '<', self.line, start_col)
-
-            if char == '>':
-                self.advance()
-                if self.current_char == '=':
-                    self.advance()
-                    return Token(TokenType.GTE, '>=', self.line, start_col)
-                return Token(TokenType.GT, '>', self.line, start_col)
-            
-            single_tokens = {
-                '+': TokenType.PLUS,
-                '-': TokenType.MINUS,
-                '*': TokenType.MULTIPLY,
-                '/': TokenType.DIVIDE,
-                '(': TokenType.LPAREN,
-                ')': TokenType.RPAREN,
-                '{': TokenType.LBRACE,
-                '}': TokenType.RBRACE,
-                ';': TokenType.SEMI,
-                ',': TokenType.COMMA
-            }
-            
-            if char in single_tokens:
-                self.advance()
-                return Token(single_tokens[char], char, self.line, start_col)
-            
-            self.error(f"Unexpected character: {char}")
-        
-        return Token(TokenType.EOF, None, self.line, self.column)
+        return next(self._iter)
+    
+    def iter_tokens(self):
+        """Generate tokens up to and including EOF"""
+        for token in self._iter:
+            yield token
+            if token.type is TokenType.EOF:
+                return
     
     def tokenize(self):
         """Return all tokens as a list"""
-        tokens = []
-        while True:
-            token = self.get_next_token()
-            tokens.append(token)
-            if token.type == TokenType.EOF:
-                break
-        return tokens
\ No newline at end of file
+        return list(self.iter_tokens())
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""Hyperscan-backed lexer for batch compilation.
+
+FastLexer compiles every token pattern into a single Hyperscan database
+and collects all matches with one scan call, then picks the longest match
+at each position (maximal munch, same result as Lexer).  When the
+hyperscan package is missing, or the text is not ASCII (Hyperscan reports
+byte offsets), it falls back to the regular Lexer.
+"""
+from bisect import bisect_left
+
+from lexer import Lexer, Token, TokenType, _KEYWORDS, _newline_offsets
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+# (group name, pattern) - the index in this list is the Hyperscan match id
+# and breaks ties between equally long matches
+PATTERNS = [
+    ('WS', rb'[ \t\r\n]+'),
+    ('COMMENT', rb'#[^\n]*'),
+    ('FLOAT', rb'[0-9]+\.[0-9]*'),
+    ('INT', rb'[0-9]+'),
+    ('STRING', rb'"[^"]*"'),
+    ('ID', rb'[A-Za-z_][A-Za-z0-9_]*'),
+    ('EQ', rb'=='),
+    ('NEQ', rb'!='),
+    ('LTE', rb'<='),
+    ('GTE', rb'>='),
+    ('AND', rb'&&'),
+    ('OR', rb'\|\|'),
+    ('ASSIGN', rb'='),
+    ('LT', rb'<'),
+    ('GT', rb'>'),
+    ('PLUS', rb'\+'),
+    ('MINUS', rb'-'),
+    ('MULTIPLY', rb'\*'),
+    ('DIVIDE', rb'/'),
+    ('LPAREN', rb'\('),
+    ('RPAREN', rb'\)'),
+    ('LBRACE', rb'\{'),
+    ('RBRACE', rb'\}'),
+    ('SEMI', rb';'),
+    ('COMMA', rb','),
+]
+
+_KINDS = [name for name, _ in PATTERNS]
+
+
+def _compile_database():
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[pattern for _, pattern in PATTERNS],
+        ids=list(range(len(PATTERNS))),
+        elements=len(PATTERNS),
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(PATTERNS),
+    )
+    return db
+
+
+DATABASE = _compile_database() if hyperscan is not None else None
+
+
+def _line_starts(text, starts):
+    """Map token start offsets to (line, column) pairs"""
+    newlines = _newline_offsets(text)
+    positions = []
+    for start in starts:
+        count = bisect_left(newlines, start)
+        last_newline = newlines[count - 1] if count else -1
+        positions.append((count + 1, start - last_newline))
+    return positions
+
+
+class FastLexer(Lexer):
+    """Lexer that tokenizes the whole text in one Hyperscan scan"""
+
+    def iter_tokens(self):
+        """Tokens come from one batch scan; iterate over its result"""
+        return iter(self.tokenize())
+
+    def tokenize(self):
+        """Return all tokens as a list"""
+        text = self.text
+        if DATABASE is None or not text.isascii():
+            return list(super().iter_tokens())
+
+        data = text.encode('ascii')
+        best = {}  # start offset -> (end offset, pattern id)
+
+        def on_match(id, start, end, flags, context):
+            prev = best.get(start)
+            if prev is None or end > prev[0] or (end == prev[0] and id < prev[1]):
+                best[start] = (end, id)
+
+        DATABASE.scan(data, match_event_handler=on_match)
+
+        # Walk the longest matches left to right; they must tile the text
+        spans = []
+        pos = 0
+        length = len(text)
+        while pos < length:
+            match = best.get(pos)
+            if match is None:
+                break
+            end, id = match
+            kind = _KINDS[id]
+            if kind != 'WS' and kind != 'COMMENT':
+                spans.append((kind, pos, end))
+            pos = end
+
+        starts = [start for _, start, _ in spans] + [pos]
+        positions = _line_starts(text, starts)
+        self.pos = pos
+        self.line, self.column = positions[-1]
+
+        if pos < length:
+            if text[pos] == '"':
+                self.error("Unterminated string")
+            self.error(f"Unexpected character: {text[pos]}")
+
+        tokens = []
+        for (kind, start, end), (line, column) in zip(spans, positions):
+            if kind == 'STRING':
+                tokens.append(Token(TokenType.STRING, text[start + 1:end - 1], line, column))
+                continue
+            lexeme = text[start:end]
+            if kind == 'ID':
+                token_type = _KEYWORDS.get(lexeme, TokenType.ID)
+                tokens.append(Token(token_type, lexeme, line, column))
+            elif kind == 'INT':
+                tokens.append(Token(TokenType.INT, int(lexeme), line, column))
+            elif kind == 'FLOAT':
+                tokens.append(Token(TokenType.FLOAT, float(lexeme), line, column))
+            else:
+                tokens.append(Token(TokenType[kind], lexeme, line, column))
+
+        tokens.append(Token(TokenType.EOF, None, self.line, self.column))
+        return tokens
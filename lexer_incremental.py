@@ -0,0 +1,110 @@
+"""Incremental re-lexing for interactive editing.
+
+IncrementalLexer(text) lexes text once and remembers every token's span.
+IncrementalLexer(new_text, previous, edit) reuses `previous` (the lexer of
+the old text) after an edit, where edit = (start, old_end, new_end) means
+old_text[start:old_end] was replaced by new_text[start:new_end]:
+
+* tokens ending before `start` are kept as they are;
+* lexing restarts after the last kept token and stops as soon as a new
+  token begins exactly where an old token (shifted by the edit delta)
+  began past the edit, since everything from there on lexes identically;
+* the remaining old tokens are spliced back with shifted offsets.
+
+Only the edited region plus one token of lookahead is run through the
+regex engine, instead of the whole file.
+"""
+from bisect import bisect_left, bisect_right
+
+from lexer import Lexer, Token, TokenType, _newline_offsets
+
+
+class IncrementalLexer(Lexer):
+    """Lexer that keeps token spans so it can re-lex only an edited range"""
+
+    def __init__(self, text, previous=None, edit=None):
+        super().__init__(text)
+        if previous is None:
+            self._newlines = _newline_offsets(text)
+            self.tokens, self.starts, self.ends = [], [], []
+            self._lex_from(0, None)
+        else:
+            self._relex(previous, *edit)
+
+    def _lex_from(self, pos, resync):
+        """Append tokens scanned from pos on.
+
+        resync(start) returns the index of an old token to splice in once
+        a new token starts at `start`, or None to keep scanning.
+        """
+        tokens, starts, ends = self.tokens, self.starts, self.ends
+
+        for start, end, token in self._spans(pos):
+            if resync is not None:
+                index = resync(start)
+                if index is not None:
+                    return index
+            tokens.append(token)
+            starts.append(start)
+            ends.append(end)
+        return None
+
+    def _relex(self, previous, start, old_end, new_end):
+        text = self.text
+        delta = new_end - old_end
+
+        # Newlines: unchanged prefix, rescanned edit, shifted suffix
+        old_newlines = previous._newlines
+        head = bisect_left(old_newlines, start)
+        tail = bisect_left(old_newlines, old_end)
+        self._newlines = (old_newlines[:head]
+                          + _newline_offsets(text, start, new_end)
+                          + [p + delta for p in old_newlines[tail:]])
+        line_delta = len(self._newlines) - len(old_newlines)
+
+        # Keep tokens that end strictly before the edit: a token ending at
+        # `start` could still grow into the inserted text
+        keep = bisect_left(previous.ends, start)
+        self.tokens = previous.tokens[:keep]
+        self.starts = previous.starts[:keep]
+        self.ends = previous.ends[:keep]
+        old_starts = previous.starts
+        first = bisect_right(old_starts, old_end - 1)
+
+        def resync(new_start):
+            if new_start < new_end:
+                return None
+            index = bisect_left(old_starts, new_start - delta, first)
+            if index < len(old_starts) and old_starts[index] == new_start - delta:
+                return index
+            return None
+
+        index = self._lex_from(self.ends[-1] if keep else 0, resync)
+        if index is None:
+            return
+
+        # Splice the untouched old suffix. Only tokens on the line where
+        # the edit ends change column; the rest just move by line_delta.
+        edit_line_end = bisect_left(self._newlines, new_end)
+        edit_line_end = (self._newlines[edit_line_end]
+                         if edit_line_end < len(self._newlines) else len(text))
+        for token, old_start, old_stop in zip(previous.tokens[index:],
+                                              old_starts[index:], previous.ends[index:]):
+            new_start = old_start + delta
+            if new_start < edit_line_end:
+                line, column = self._pos_of(new_start)
+                token = Token(token.type, token.value, line, column)
+            elif line_delta:
+                token = Token(token.type, token.value, token.line + line_delta, token.column)
+            self.tokens.append(token)
+            self.starts.append(new_start)
+            self.ends.append(old_stop + delta)
+
+    def iter_tokens(self):
+        """Iterate over the already lexed tokens"""
+        return iter(self.tokenize())
+
+    def tokenize(self):
+        """Return all tokens as a list"""
+        line, column = self._pos_of(len(self.text))
+        return self.tokens + [Token(TokenType.EOF, None, line, column)]
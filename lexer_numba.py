@@ -0,0 +1,228 @@
+"""Numba-compiled lexer.
+
+_scan walks the (ASCII) bytes of the source as a uint8 array, classifies
+each byte through a 256-entry table and writes one (type, start, end)
+triple per token into preallocated arrays; it runs as native code with no
+per-character boxing. Keywords, literal values and line/column positions
+are resolved afterwards in Python. NumbaLexer falls back to the regular
+Lexer when numba/numpy are not installed or the text is not ASCII.
+"""
+from lexer import Lexer, Token, TokenType, _KEYWORDS
+
+try:
+    import numpy as np
+    from numba import njit
+except (ImportError, AttributeError):
+    # AttributeError: numpy's import of inspect picks up this repo's ast.py
+    # in place of the stdlib module when run from the repo directory
+    np = None
+    njit = None
+
+
+# Byte classes
+C_OTHER = 0
+C_SPACE = 1
+C_DIGIT = 2
+C_ALPHA = 3
+C_QUOTE = 4
+C_HASH = 5
+C_OP = 6
+
+# Plain ints so numba treats them as compile-time constants
+T_ID = int(TokenType.ID)
+T_INT = int(TokenType.INT)
+T_FLOAT = int(TokenType.FLOAT)
+T_STRING = int(TokenType.STRING)
+T_EQ = int(TokenType.EQ)
+T_NEQ = int(TokenType.NEQ)
+T_LTE = int(TokenType.LTE)
+T_GTE = int(TokenType.GTE)
+T_AND = int(TokenType.AND)
+T_OR = int(TokenType.OR)
+
+# TokenType member for each int value; indexing skips the Enum call
+_TYPES = [None] * (max(TokenType) + 1)
+for _type in TokenType:
+    _TYPES[_type] = _type
+del _type
+
+_SINGLE = {
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.MULTIPLY,
+    '/': TokenType.DIVIDE,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    ';': TokenType.SEMI,
+    ',': TokenType.COMMA,
+    '=': TokenType.ASSIGN,
+    '<': TokenType.LT,
+    '>': TokenType.GT,
+}
+
+
+def _build_tables():
+    classes = [C_OTHER] * 256
+    ops = [0] * 256
+    for c in ' \t\r\n':
+        classes[ord(c)] = C_SPACE
+    for c in '0123456789':
+        classes[ord(c)] = C_DIGIT
+    for c in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_':
+        classes[ord(c)] = C_ALPHA
+    classes[ord('"')] = C_QUOTE
+    classes[ord('#')] = C_HASH
+    for c, token_type in _SINGLE.items():
+        classes[ord(c)] = C_OP
+        ops[ord(c)] = int(token_type)
+    # Only valid as the first half of != && ||
+    for c in '!&|':
+        classes[ord(c)] = C_OP
+    return classes, ops
+
+
+def _scan(buf, classes, ops, out_type, out_start, out_end):
+    """Tokenize buf into the out_* arrays.
+
+    Returns the number of tokens, or -(offset + 1) of the first byte that
+    does not start a valid token.
+    """
+    n = len(buf)
+    i = 0
+    k = 0
+    while i < n:
+        c = buf[i]
+        cls = classes[c]
+        if cls == C_SPACE:
+            i += 1
+            continue
+        if cls == C_HASH:
+            while i < n and buf[i] != 10:
+                i += 1
+            continue
+
+        start = i
+        if cls == C_DIGIT:
+            token_type = T_INT
+            while i < n and classes[buf[i]] == C_DIGIT:
+                i += 1
+            if i < n and buf[i] == 46:  # '.'
+                token_type = T_FLOAT
+                i += 1
+                while i < n and classes[buf[i]] == C_DIGIT:
+                    i += 1
+        elif cls == C_ALPHA:
+            token_type = T_ID
+            i += 1
+            while i < n and (classes[buf[i]] == C_ALPHA or classes[buf[i]] == C_DIGIT):
+                i += 1
+        elif cls == C_QUOTE:
+            token_type = T_STRING
+            i += 1
+            while i < n and buf[i] != 34:  # '"'
+                i += 1
+            if i == n:
+                return -start - 1
+            i += 1
+        elif cls == C_OP:
+            nxt = buf[i + 1] if i + 1 < n else 0
+            if nxt == 61 and c == 61:  # ==
+                token_type = T_EQ
+                i += 2
+            elif nxt == 61 and c == 33:  # !=
+                token_type = T_NEQ
+                i += 2
+            elif nxt == 61 and c == 60:  # <=
+                token_type = T_LTE
+                i += 2
+            elif nxt == 61 and c == 62:  # >=
+                token_type = T_GTE
+                i += 2
+            elif nxt == 38 and c == 38:  # &&
+                token_type = T_AND
+                i += 2
+            elif nxt == 124 and c == 124:  # ||
+                token_type = T_OR
+                i += 2
+            else:
+                token_type = ops[c]
+                if token_type == 0:
+                    return -start - 1
+                i += 1
+        else:
+            return -start - 1
+
+        out_type[k] = token_type
+        out_start[k] = start
+        out_end[k] = i
+        k += 1
+    return k
+
+
+if np is not None:
+    _CLASSES, _OPS = (np.array(table, dtype=np.int64) for table in _build_tables())
+    _scan = njit(cache=True)(_scan)
+
+
+class NumbaLexer(Lexer):
+    """Lexer whose byte loop is compiled to native code by numba"""
+
+    def iter_tokens(self):
+        """Tokens come from one batch scan; iterate over its result"""
+        return iter(self.tokenize())
+
+    def tokenize(self):
+        """Return all tokens as a list"""
+        text = self.text
+        if np is None or not text.isascii():
+            return list(super().iter_tokens())
+
+        buf = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        size = len(buf) + 1  # worst case: one token per byte
+        out_type = np.empty(size, dtype=np.int64)
+        out_start = np.empty(size, dtype=np.int64)
+        out_end = np.empty(size, dtype=np.int64)
+        count = _scan(buf, _CLASSES, _OPS, out_type, out_start, out_end)
+
+        newline_offsets = np.flatnonzero(buf == 10)
+        if count < 0:
+            self._set_position(newline_offsets, -count - 1)
+            if text[self.pos] == '"':
+                self.error("Unterminated string")
+            self.error(f"Unexpected character: {text[self.pos]}")
+
+        types = out_type[:count].tolist()
+        starts = out_start[:count].tolist()
+        ends = out_end[:count].tolist()
+        # Number of newlines before each token start = its 0-based line
+        line_indices = np.searchsorted(newline_offsets, out_start[:count]).tolist()
+        newlines = newline_offsets.tolist()
+
+        tokens = []
+        for token_type, start, end, index in zip(types, starts, ends, line_indices):
+            line = index + 1
+            column = start - (newlines[index - 1] if index else -1)
+            if token_type == T_ID:
+                lexeme = text[start:end]
+                tokens.append(Token(_KEYWORDS.get(lexeme, TokenType.ID), lexeme, line, column))
+            elif token_type == T_INT:
+                tokens.append(Token(TokenType.INT, int(text[start:end]), line, column))
+            elif token_type == T_FLOAT:
+                tokens.append(Token(TokenType.FLOAT, float(text[start:end]), line, column))
+            elif token_type == T_STRING:
+                tokens.append(Token(TokenType.STRING, text[start + 1:end - 1], line, column))
+            else:
+                tokens.append(Token(_TYPES[token_type], text[start:end], line, column))
+
+        self._set_position(newline_offsets, len(text))
+        tokens.append(Token(TokenType.EOF, None, self.line, self.column))
+        return tokens
+
+    def _set_position(self, newline_offsets, offset):
+        """Point pos/line/column at a byte offset (for errors and EOF)"""
+        index = int(np.searchsorted(newline_offsets, offset))
+        self.pos = offset
+        self.line = index + 1
+        self.column = offset - (int(newline_offsets[index - 1]) if index else -1)
@@ -1,15 +1,45 @@
+import os
 import sys
-from lexer import Lexer
-from parser import Parser
+from lexer import Lexer, LexerError
+from lexer_incremental import IncrementalLexer
+from parser import Parser, tokenize
 from visitor import PrintVisitor
 
+def relex(code, previous, edit):
+    """Re-lex code after an edit, reusing the previous lexer's tokens"""
+    try:
+        return IncrementalLexer(code, previous, edit if previous else None)
+    except LexerError:
+        # Unfinished input (e.g. an open string); lex it again once complete
+        return None
+
+def read_source(filename):
+    """Read a whole source file with one os.read per chunk and decode it once"""
+    fd = os.open(filename, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
+        while True:
+            # st_size is only a hint (the file may grow, or be a pipe)
+            chunk = os.read(fd, max(size, 1 << 16))
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    code = b"".join(chunks).decode('utf-8')
+    # Same newline translation as reading in text mode
+    if '\r' in code:
+        code = code.replace('\r\n', '\n').replace('\r', '\n')
+    return code
+
 def main():
+    lexer = None
     if len(sys.argv) > 1:
         # Read from file
         filename = sys.argv[1]
         try:
-            with open(filename, 'r') as f:
-                code = f.read()
+            code = read_source(filename)
         except FileNotFoundError:
             print(f"Error: File '{filename}' not found")
             return
@@ -19,14 +49,15 @@ def main():
         print("Enter your code (end with empty line):")
         print("-" * 40)
         
-        lines = []
+        code = ""
         while True:
             line = input()
             if line.strip() == "":
                 break
-            lines.append(line)
-        
-        code = "\n".join(lines)
+            # Each line is an edit appended at the end of the buffer
+            start = len(code)
+            code = code + "\n" + line if code else line
+            lexer = relex(code, lexer, (start, start, len(code)))
     
     if not code.strip():
         print("No input provided")
@@ -37,8 +68,9 @@ def main():
     print("="*60)
     
     # Lexing
-    lexer = Lexer(code)
-    tokens = lexer.tokenize()
+    if lexer is None:
+        lexer = Lexer(code)
+    tokens = tokenize(lexer)
     
     print(f"\nTokens generated: {len(tokens)}")
     if len(tokens) <= 20:  # Don't flood output
@@ -46,7 +78,7 @@ def main():
             print(f"  {token}")
     
     # Parsing
-    parser = Parser(lexer)
+    parser = Parser.from_tokens(tokens, code)
     ast = parser.parse()
     
     # AST Output
@@ -0,0 +1,242 @@
+"""Single-pass AST optimizer.
+
+FusedOptimizer applies every rewrite in one post-order traversal instead
+of one tree walk per pass. At each node, after its children have been
+optimized:
+
+1. constant folding of numeric and string literals,
+2. identity simplification (x + 0, 0 + x, x - 0, x * 1, 1 * x),
+3. type annotation (`types`, keyed by node) using the already-folded
+   children, recording definite mismatches in `type_errors`,
+
+and `if`/`while` statements whose condition is known at compile time
+lose the branch that can never run. The input tree is not modified: changed nodes
+are rebuilt and unchanged subtrees are shared.
+"""
+import operator
+
+from ast import *
+from visitor import ASTVisitor
+
+_FOLD = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+
+# Produce booleans, which have no literal node; folded only in conditions
+_COMPARISONS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '&&': lambda a, b: bool(a) and bool(b),
+    '||': lambda a, b: bool(a) or bool(b),
+}
+
+_NUMERIC = frozenset({'int', 'float'})
+
+_LITERAL_TYPES = {
+    IntegerLiteral: 'int',
+    FloatLiteral: 'float',
+    StringLiteral: 'string',
+}
+
+
+def _make_literal(value):
+    if type(value) is int:
+        return IntegerLiteral(value)
+    if type(value) is float:
+        return FloatLiteral(value)
+    return StringLiteral(value)
+
+
+def _truth(condition):
+    """Truth value of a condition known at compile time, else None"""
+    if isinstance(condition, Literal):
+        return bool(condition.value)
+    if (type(condition) is BinaryOp and condition.op in _COMPARISONS
+            and isinstance(condition.left, Literal)
+            and isinstance(condition.right, Literal)):
+        try:
+            return bool(_COMPARISONS[condition.op](condition.left.value,
+                                                   condition.right.value))
+        except TypeError:
+            return None
+    return None
+
+
+def _is_int(node, value):
+    return type(node) is IntegerLiteral and node.value == value
+
+
+class FusedOptimizer(ASTVisitor):
+    """Visitor whose visit_* methods return the optimized node (or None
+    for a statement that was removed)"""
+
+    def __init__(self):
+        super().__init__()
+        # Node -> 'int', 'float', 'string' or 'bool'; unknown types are absent
+        self.types = {}
+        self.type_errors = []
+
+    def _statements(self, statements):
+        dispatch = self._DISPATCH
+        result = []
+        for stmt in statements:
+            new = dispatch[type(stmt)](self, stmt)
+            if new is not None:
+                result.append(new)
+        return result
+
+    # ============ STATEMENTS ============
+
+    def visit_program(self, node: Program):
+        return Program(self._statements(node.statements))
+
+    def visit_var_declaration(self, node: VarDeclaration):
+        value = self._DISPATCH[type(node.value)](self, node.value)
+        if value is node.value:
+            return node
+        return VarDeclaration(node.var_name, value)
+
+    def visit_assignment(self, node: Assignment):
+        value = self._DISPATCH[type(node.value)](self, node.value)
+        if value is node.value:
+            return node
+        return Assignment(node.var_name, value)
+
+    def visit_if_statement(self, node: IfStatement):
+        condition = self._DISPATCH[type(node.condition)](self, node.condition)
+        then_block = self._DISPATCH[type(node.then_block)](self, node.then_block)
+        else_block = self._DISPATCH[type(node.else_block)](self, node.else_block) if node.else_block else None
+
+        truth = _truth(condition)
+        if truth is not None:
+            return then_block if truth else else_block
+        if (condition is node.condition and then_block is node.then_block
+                and else_block is node.else_block):
+            return node
+        return IfStatement(condition, then_block, else_block)
+
+    def visit_while_statement(self, node: WhileStatement):
+        condition = self._DISPATCH[type(node.condition)](self, node.condition)
+        if _truth(condition) is False:
+            return None
+        body = self._DISPATCH[type(node.body)](self, node.body)
+        if condition is node.condition and body is node.body:
+            return node
+        return WhileStatement(condition, body)
+
+    def visit_function_declaration(self, node: FunctionDeclaration):
+        body = self._DISPATCH[type(node.body)](self, node.body)
+        if body is node.body:
+            return node
+        return FunctionDeclaration(node.func_name, node.params, body)
+
+    def visit_return_statement(self, node: ReturnStatement):
+        value = self._DISPATCH[type(node.value)](self, node.value)
+        if value is node.value:
+            return node
+        return ReturnStatement(value)
+
+    def visit_expression_statement(self, node: ExpressionStatement):
+        expression = self._DISPATCH[type(node.expression)](self, node.expression)
+        if expression is node.expression:
+            return node
+        return ExpressionStatement(expression)
+
+    def visit_block(self, node: Block):
+        statements = self._statements(node.statements)
+        if len(statements) == len(node.statements) and all(
+                new is old for new, old in zip(statements, node.statements)):
+            return node
+        return Block(statements)
+
+    # ============ EXPRESSIONS ============
+
+    def visit_binary_op(self, node: BinaryOp):
+        left = self._DISPATCH[type(node.left)](self, node.left)
+        right = self._DISPATCH[type(node.right)](self, node.right)
+        op = node.op
+        types = self.types
+        left_type = types.get(left)
+        right_type = types.get(right)
+
+        # (a) constant folding
+        fold = _FOLD.get(op)
+        if fold is not None and isinstance(left, Literal) and isinstance(right, Literal):
+            if left_type in _NUMERIC and right_type in _NUMERIC:
+                if not (op == '/' and right.value == 0):
+                    return self.visit_literal(_make_literal(fold(left.value, right.value)))
+            elif op == '+' and left_type == right_type == 'string':
+                return self.visit_literal(StringLiteral(left.value + right.value))
+
+        # (b) identity simplification, only for operands known to be
+        # numbers: with a string x, x + 0 and x * 1 are not x
+        if op == '+' and left_type in _NUMERIC and _is_int(right, 0):
+            return left
+        if op == '+' and right_type in _NUMERIC and _is_int(left, 0):
+            return right
+        if op == '-' and left_type in _NUMERIC and _is_int(right, 0):
+            return left
+        if op == '*' and left_type in _NUMERIC and _is_int(right, 1):
+            return left
+        if op == '*' and right_type in _NUMERIC and _is_int(left, 1):
+            return right
+
+        if left is not node.left or right is not node.right:
+            node = BinaryOp(left, op, right)
+
+        # (c) type annotation
+        if op in _COMPARISONS:
+            types[node] = 'bool'
+        elif left_type in _NUMERIC and right_type in _NUMERIC:
+            if op == '/' or 'float' in (left_type, right_type):
+                types[node] = 'float'
+            else:
+                types[node] = 'int'
+        elif op == '+' and left_type == right_type == 'string':
+            types[node] = 'string'
+        elif left_type is not None and right_type is not None:
+            self.type_errors.append(
+                f"unsupported operand types for {op}: '{left_type}' and '{right_type}'")
+        return node
+
+    def visit_unary_op(self, node: UnaryOp):
+        expr = self._DISPATCH[type(node.expr)](self, node.expr)
+        expr_type = self.types.get(expr)
+        if expr_type in _NUMERIC:
+            if isinstance(expr, Literal):
+                value = -expr.value if node.op == '-' else expr.value
+                return self.visit_literal(_make_literal(value))
+            if node.op == '+':
+                return expr
+        if expr is not node.expr:
+            node = UnaryOp(node.op, expr)
+        if expr_type in _NUMERIC:
+            self.types[node] = expr_type
+        return node
+
+    def visit_call_expression(self, node: CallExpression):
+        arguments = [self._DISPATCH[type(arg)](self, arg) for arg in node.arguments]
+        if all(new is old for new, old in zip(arguments, node.arguments)):
+            return node
+        return CallExpression(node.func_name, arguments)
+
+    def visit_identifier(self, node: Identifier):
+        return node
+
+    def visit_literal(self, node: Literal):
+        literal_type = _LITERAL_TYPES.get(type(node))
+        if literal_type is not None:
+            self.types[node] = literal_type
+        return node
+
+
+def optimize(program: Program) -> Program:
+    """Return an optimized copy of program"""
+    return FusedOptimizer().visit(program)
@@ -1,249 +1,330 @@
 from lexer import Lexer, Token, TokenType
 from ast import *
+from ast_soa import ASTArena, NodeKind, OP_CODES
+
+
+# Left binding power of each binary operator; higher binds tighter and
+# operators of equal power associate to the left.
+_LBP = {
+    TokenType.OR: 1,
+    TokenType.AND: 2,
+    TokenType.EQ: 3,
+    TokenType.NEQ: 3,
+    TokenType.LT: 3,
+    TokenType.GT: 3,
+    TokenType.LTE: 3,
+    TokenType.GTE: 3,
+    TokenType.PLUS: 4,
+    TokenType.MINUS: 4,
+    TokenType.MULTIPLY: 5,
+    TokenType.DIVIDE: 5,
+}
+
+# Right binding powers for Parser.parse_expr. Conditions and parenthesized
+# expressions take every operator; the other expression positions stop
+# before comparisons and logical operators, as in grammar.txt.
+CONDITION = 0
+ARITHMETIC = 3
+
+_new_node = object.__new__
+
+# Tokens where error recovery stops skipping, as a bit per token type
+SYNC_MASK = 0
+for _type in (
+    TokenType.SEMI,
+    TokenType.RBRACE,
+    TokenType.IF,
+    TokenType.WHILE,
+    TokenType.DEF,
+    TokenType.RETURN,
+    TokenType.VAR,
+):
+    SYNC_MASK |= 1 << _type
+del _type
+
+
+# Token lists already lexed, keyed by lexer class and source text, so a
+# snippet that is lexed for display and then parsed is only scanned once.
+# Keying on the text itself rather than id(text) keeps a recycled id from
+# returning another source's tokens. Sources longer than _TOK_CACHE_TEXT
+# characters are not cached, so a large file's tokens are freed together
+# with its parser.
+_tok_cache = {}
+_TOK_CACHE_SIZE = 64
+_TOK_CACHE_TEXT = 1 << 16
+
+
+def tokenize(lexer: Lexer) -> list:
+    """Return lexer's tokens, reusing an earlier list for the same source"""
+    text = getattr(lexer, 'text', None)
+    if text is None or len(text) > _TOK_CACHE_TEXT:
+        return lexer.tokenize()
+    key = (type(lexer), text)
+    tokens = _tok_cache.get(key)
+    if tokens is None:
+        tokens = lexer.tokenize()
+        if len(_tok_cache) >= _TOK_CACHE_SIZE:
+            # Drop the oldest entry
+            del _tok_cache[next(iter(_tok_cache))]
+        _tok_cache[key] = tokens
+    return tokens
 
 
 class Parser:
-    def __init__(self, lexer: Lexer):
+    # Node constructors used by the parse_* methods. ArenaParser overrides
+    # them to append nodes to an ASTArena and return handles instead.
+    _int = IntegerLiteral
+    _float = FloatLiteral
+    _string = StringLiteral
+    _identifier = Identifier
+    _unary = UnaryOp
+    _call = CallExpression
+    _var_declaration = VarDeclaration
+    _assignment = Assignment
+    _if = IfStatement
+    _while = WhileStatement
+    _function = FunctionDeclaration
+    _return = ReturnStatement
+    _block = Block
+    _expression_statement = ExpressionStatement
+    _program = Program
+    
+    def __init__(self, lexer: Lexer, tokens: list = None):
         self.lexer = lexer
-        self.tokens = lexer.tokenize()
-        self.current_token_index = 0
-        self.current_token = self.tokens[0] if self.tokens else None
+        self.tokens = tokenize(lexer) if tokens is None else tokens
+        # Token types and values as parallel lists indexed by self.i; the
+        # Token objects themselves are only consulted for error positions.
+        # The extra slot past EOF (type None) is where the parser stands
+        # once it has consumed EOF during error recovery.
+        self.types = [token.type for token in self.tokens] + [None]
+        self.values = [token.value for token in self.tokens] + [None]
+        self.i = 0
         self.had_error = False 
+        # (token index, message) per error, printed by report_errors()
+        self.errors = []
+        
+        # Token type -> handler for the token that starts a statement/factor
+        self._stmt_dispatch = {
+            TokenType.VAR: self.parse_var_declaration,
+            TokenType.IF: self.parse_if_statement,
+            TokenType.WHILE: self.parse_while_statement,
+            TokenType.DEF: self.parse_function_declaration,
+            TokenType.RETURN: self.parse_return_statement,
+            TokenType.ID: self._parse_id_statement,
+            TokenType.ELSE: self._parse_stray_else,
+        }
+        self._factor_dispatch = {
+            TokenType.INT: self._parse_int,
+            TokenType.FLOAT: self._parse_float,
+            TokenType.STRING: self._parse_string,
+            TokenType.ID: self._parse_id,
+            TokenType.LPAREN: self._parse_group,
+            TokenType.PLUS: self._parse_unary,
+            TokenType.MINUS: self._parse_unary,
+        }
+    
+    @classmethod
+    def from_tokens(cls, tokens: list, text: str = ''):
+        """Parser over an already lexed token list (ending in EOF).
+        
+        text is the source the tokens came from; it is only used to show
+        the offending line in error reports.
+        """
+        return cls(Lexer(text), tokens)
     
     def error(self, message: str):
-        """Report parsing error without crashing"""
-        if self.current_token and self.current_token.type == TokenType.EOF:
-            self.had_error = True
+        """Record a parsing error without crashing; parse() reports it"""
+        self.had_error = True
+        if self.types[self.i] is TokenType.EOF:
             return
 
-        self.had_error = True
-        line = self.current_token.line if self.current_token else 1
-        col = self.current_token.column if self.current_token else 1
-        
-        print(f"\n❌ PARSER ERROR at line {line}, column {col}:")
-        print(f"   {message}")
-        
-        if hasattr(self.lexer, 'text'):
-            lines = self.lexer.text.split('\n')
-            if line - 1 < len(lines):
-                print(f"   {lines[line-1]}")
-                print(f"   {' ' * (col-1)}^")
-        
+        self.errors.append((self.i, message))
         self.synchronize()
     
+    def report_errors(self):
+        """Print the recorded errors, each with its source line and a caret"""
+        errors = self.errors
+        if not errors:
+            return
+        # Split the source once, and only when there is something to show
+        text = getattr(self.lexer, 'text', None)
+        lines = text.split('\n') if text is not None else None
+        tokens = self.tokens
+        out = []
+        for index, message in errors:
+            token = tokens[index] if index < len(tokens) else None
+            line = token.line if token else 1
+            col = token.column if token else 1
+            
+            out.append(f"\n❌ PARSER ERROR at line {line}, column {col}:")
+            out.append(f"   {message}")
+            
+            if lines is not None and line - 1 < len(lines):
+                out.append(f"   {lines[line-1]}")
+                out.append(f"   {' ' * (col-1)}^")
+        print('\n'.join(out))
+        errors.clear()
+    
     def synchronize(self):
-        sync_tokens = {
-            TokenType.SEMI,
-            TokenType.RBRACE,
-            TokenType.IF,
-            TokenType.WHILE,
-            TokenType.DEF,
-            TokenType.RETURN,
-            TokenType.VAR
-        }
-
-        while self.current_token and self.current_token.type not in sync_tokens:
-            self.current_token_index += 1
-            if self.current_token_index < len(self.tokens):
-                self.current_token = self.tokens[self.current_token_index]
-            else:
-                self.current_token = None
+        # The None sentinel past EOF is never tested against the mask
+        i = self.i
+        types = self.types
+        last = len(types) - 1
+        while i < last and not (1 << types[i]) & SYNC_MASK:
+            i += 1
 
-        if self.current_token and self.current_token.type == TokenType.SEMI:
-            self.current_token_index += 1
-            if self.current_token_index < len(self.tokens):
-                self.current_token = self.tokens[self.current_token_index]
-            else:
-                self.current_token = None
+        if types[i] is TokenType.SEMI:
+            i += 1
+        self.i = i
 
             
     
     def eat(self, token_type: TokenType):
         """Consume current token if it matches expected type"""
-        if self.current_token and self.current_token.type == token_type:
-            self.current_token_index += 1
-            if self.current_token_index < len(self.tokens):
-                self.current_token = self.tokens[self.current_token_index]
-            else:
-                self.current_token = None
+        current = self.types[self.i]
+        if current is token_type:
+            self.i += 1
         else:
-            expected = token_type
-            found = self.current_token.type if self.current_token else "EOF"
+            expected = token_type.name
+            found = current.name if current is not None else "EOF"
             self.error(f"Expected {expected}, found {found}")
     
     def peek(self, token_type: TokenType) -> bool:
         """Check next token without consuming it"""
-        if self.current_token and self.current_token.type == token_type:
-            return True
-        return False
+        return self.types[self.i] is token_type
     
     def peek_ahead(self, n: int = 1) -> Token:
         """Look ahead n tokens"""
-        idx = self.current_token_index + n
-        if idx < len(self.tokens):
-            return self.tokens[idx]
-        return Token(TokenType.EOF, None, 0, 0)
+        # Past the end, answer with the EOF token that ends the list
+        tokens = self.tokens
+        idx = self.i + n
+        return tokens[idx] if idx < len(tokens) else tokens[-1]
     
     # ============ EXPRESSION PARSING ============
     
     def parse_factor(self) -> Expression:
         """factor → INT | FLOAT | STRING | ID | "(" expr ")" | call_expr"""
-        token = self.current_token
-        
-        if token.type == TokenType.INT:
-            self.eat(TokenType.INT)
-            return IntegerLiteral(token.value)
-        
-        elif token.type == TokenType.FLOAT:
-            self.eat(TokenType.FLOAT)
-            return FloatLiteral(token.value)
-        
-        elif token.type == TokenType.STRING:
-            self.eat(TokenType.STRING)
-            return StringLiteral(token.value)
-        
-        elif token.type == TokenType.ID:
-            # Check if it's a function call
-            if self.peek_ahead().type == TokenType.LPAREN:
-                return self.parse_call_expression()
-            else:
-                self.eat(TokenType.ID)
-                return Identifier(token.value)
-        
-        elif token.type == TokenType.LPAREN:
-            self.eat(TokenType.LPAREN)
-            expr = self.parse_logical_or()
+        token_type = self.types[self.i]
+        handler = self._factor_dispatch.get(token_type)
+        if handler is not None:
+            return handler()
+        
+        self.error(f"Unexpected token in factor: {token_type.name}")
+        self.eat(token_type)
+        return self._int(0)
+    
+    def _parse_int(self) -> Expression:
+        self.i += 1
+        return self._int(self.values[self.i - 1])
+    
+    def _parse_float(self) -> Expression:
+        self.i += 1
+        return self._float(self.values[self.i - 1])
+    
+    def _parse_string(self) -> Expression:
+        self.i += 1
+        return self._string(self.values[self.i - 1])
+    
+    def _parse_id(self) -> Expression:
+        # Check if it's a function call (an ID is never the last token)
+        if self.types[self.i + 1] is TokenType.LPAREN:
+            return self.parse_call_expression()
+        self.i += 1
+        return self._identifier(self.values[self.i - 1])
+    
+    def _parse_group(self) -> Expression:
+        self.i += 1
+        expr = self.parse_expr()
 
-            self.eat(TokenType.RPAREN)
-            return expr
-        
-        elif token.type in (TokenType.PLUS, TokenType.MINUS):
-            op = token.value
-            self.eat(token.type)
-            expr = self.parse_factor()
-            return UnaryOp(op, expr)
-        
-        else:
-            self.error(f"Unexpected token in factor: {token.type}")
-            self.eat(token.type)
-            return IntegerLiteral(0)  
+        self.eat(TokenType.RPAREN)
+        return expr
+    
+    def _parse_unary(self) -> Expression:
+        op = self.values[self.i]
+        self.i += 1
+        expr = self.parse_factor()
+        return self._unary(op, expr)
 
     
     def parse_call_expression(self) -> CallExpression:
         """call_expr → ID "(" arg_list? ")" """
-        func_name = self.current_token.value
+        func_name = self.values[self.i]
         self.eat(TokenType.ID)
         self.eat(TokenType.LPAREN)
         
         arguments = []
-        if not self.peek(TokenType.RPAREN):
-            arguments.append(self.parse_expression())
-            while self.peek(TokenType.COMMA):
-                self.eat(TokenType.COMMA)
-                arguments.append(self.parse_expression())
+        types = self.types
+        if types[self.i] is not TokenType.RPAREN:
+            append = arguments.append
+            parse_expr = self.parse_expr
+            COMMA = TokenType.COMMA
+            append(parse_expr(ARITHMETIC))
+            while types[self.i] is COMMA:
+                self.i += 1
+                append(parse_expr(ARITHMETIC))
         
         self.eat(TokenType.RPAREN)
-        return CallExpression(func_name, arguments)
+        return self._call(func_name, arguments)
     
-    def parse_term(self) -> Expression:
-        """term → factor (("*" | "/") factor)*"""
+    def parse_expr(self, rbp: int = CONDITION) -> Expression:
+        """expr → factor (op expr)*, taking each op that binds tighter than rbp"""
         node = self.parse_factor()
         
-        while self.current_token and self.current_token.type in (TokenType.MULTIPLY, TokenType.DIVIDE):
-            op = self.current_token.value
-            self.eat(self.current_token.type)
-            right = self.parse_factor()
-            node = BinaryOp(node, op, right)
-        
-        return node
-    
-    def parse_expression(self) -> Expression:
-        """expr → term (("+" | "-") term)*"""
-        node = self.parse_term()
-        
-        while self.current_token and self.current_token.type in (TokenType.PLUS, TokenType.MINUS):
-            op = self.current_token.value
-            self.eat(self.current_token.type)
-            right = self.parse_term()
-            node = BinaryOp(node, op, right)
+        types = self.types
+        binding_power = _LBP.get
+        lbp = binding_power(types[self.i], 0)
+        while lbp > rbp:
+            op = self.values[self.i]
+            self.i += 1
+            right = self.parse_expr(lbp)
+            # Fill the slots directly rather than calling BinaryOp.__init__
+            left, node = node, _new_node(BinaryOp)
+            node.left = left
+            node.op = op
+            node.right = right
+            lbp = binding_power(types[self.i], 0)
         
         return node
-    
-    def parse_comparison(self) -> Expression:
-        """comparison → expr ((">" | "<" | "==" | "!=") expr)?"""
-        node = self.parse_expression()
-        
-        while self.current_token and self.current_token.type in (
-            TokenType.GT,
-            TokenType.LT,
-            TokenType.GTE,
-            TokenType.LTE,
-            TokenType.EQ,
-            TokenType.NEQ,
-        ):
-
-            op = self.current_token.value
-            self.eat(self.current_token.type)
-            right = self.parse_expression()
-            node = BinaryOp(node, op, right)
-        
-        return node
-    
-    def parse_logical_and(self) -> Expression:
-        node = self.parse_comparison()
-
-        while self.current_token and self.current_token.type == TokenType.AND:
-            op = self.current_token.value
-            self.eat(TokenType.AND)
-            right = self.parse_comparison()
-            node = BinaryOp(node, op, right)
-
-        return node
-
-
-    def parse_logical_or(self) -> Expression:
-        node = self.parse_logical_and()
-
-        while self.current_token and self.current_token.type == TokenType.OR:
-            op = self.current_token.value
-            self.eat(TokenType.OR)
-            right = self.parse_logical_and()
-            node = BinaryOp(node, op, right)
-
-        return node
 
     # ============ STATEMENT PARSING ============
     
     def parse_var_declaration(self) -> VarDeclaration:
         """var_decl → "var" ID "=" expr ";" """
         self.eat(TokenType.VAR)
-        var_name = self.current_token.value
+        var_name = self.values[self.i]
         self.eat(TokenType.ID)
         self.eat(TokenType.ASSIGN)
-        value = self.parse_expression()
-        self.eat(TokenType.SEMI)
-        return VarDeclaration(var_name, value)
+        value = self.parse_expr(ARITHMETIC)
+        # Inline eat() for the common case; eat() reports a mismatch
+        if self.types[self.i] is TokenType.SEMI:
+            self.i += 1
+        else:
+            self.eat(TokenType.SEMI)
+        return self._var_declaration(var_name, value)
     
     def parse_assignment(self) -> Assignment:
-        var_name = self.current_token.value
+        var_name = self.values[self.i]
         self.eat(TokenType.ID)
         self.eat(TokenType.ASSIGN)
 
         if self.peek(TokenType.SEMI):
             self.error("Missing expression in assignment")
             self.eat(TokenType.SEMI)
-            return Assignment(var_name, IntegerLiteral(0))
+            return self._assignment(var_name, self._int(0))
 
-        value = self.parse_expression()
-        self.eat(TokenType.SEMI)
-        return Assignment(var_name, value)
+        value = self.parse_expr(ARITHMETIC)
+        if self.types[self.i] is TokenType.SEMI:
+            self.i += 1
+        else:
+            self.eat(TokenType.SEMI)
+        return self._assignment(var_name, value)
 
     
     def parse_if_statement(self) -> IfStatement:
         """if_stmt → "if" "(" expr ")" block ("else" block)? """
         self.eat(TokenType.IF)
         self.eat(TokenType.LPAREN)
-        condition = self.parse_logical_or()
+        condition = self.parse_expr()
         self.eat(TokenType.RPAREN)
         
         then_block = self.parse_block()
@@ -254,121 +335,126 @@ class Parser:
 
             if self.peek(TokenType.IF):
                 # else if → else { if (...) { ... } }
-                else_block = Block([self.parse_if_statement()])
+                else_block = self._block([self.parse_if_statement()])
             else:
                 else_block = self.parse_block()
 
         
-        return IfStatement(condition, then_block, else_block)
+        return self._if(condition, then_block, else_block)
     
     def parse_while_statement(self) -> WhileStatement:
         """while_stmt → "while" "(" expr ")" block """
         self.eat(TokenType.WHILE)
         self.eat(TokenType.LPAREN)
-        condition = self.parse_logical_or()
+        condition = self.parse_expr()
         self.eat(TokenType.RPAREN)
         body = self.parse_block()
-        return WhileStatement(condition, body)
+        return self._while(condition, body)
     
     def parse_function_declaration(self) -> FunctionDeclaration:
         """func_decl → "def" ID "(" param_list? ")" block """
         self.eat(TokenType.DEF)
-        func_name = self.current_token.value
+        func_name = self.values[self.i]
         self.eat(TokenType.ID)
         self.eat(TokenType.LPAREN)
         
         params = []
-        if not self.peek(TokenType.RPAREN):
-            if not self.peek(TokenType.ID):
+        types = self.types
+        if types[self.i] is not TokenType.RPAREN:
+            append = params.append
+            if types[self.i] is not TokenType.ID:
                 self.error("Expected parameter name")
             else:
-                params.append(self.current_token.value)
-                self.eat(TokenType.ID)
+                append(self.values[self.i])
+                self.i += 1
 
-            while self.peek(TokenType.COMMA):
-                self.eat(TokenType.COMMA)
-                params.append(self.current_token.value)
+            while types[self.i] is TokenType.COMMA:
+                self.i += 1
+                append(self.values[self.i])
                 self.eat(TokenType.ID)
         
         self.eat(TokenType.RPAREN)
         body = self.parse_block()
-        return FunctionDeclaration(func_name, params, body)
+        return self._function(func_name, params, body)
     
     def parse_return_statement(self) -> ReturnStatement:
         """return_stmt → "return" expr ";" """
         self.eat(TokenType.RETURN)
-        value = self.parse_expression()
-        self.eat(TokenType.SEMI)
-        return ReturnStatement(value)
+        value = self.parse_expr(ARITHMETIC)
+        if self.types[self.i] is TokenType.SEMI:
+            self.i += 1
+        else:
+            self.eat(TokenType.SEMI)
+        return self._return(value)
     
     def parse_block(self) -> Block:
         """block → "{" statement* "}" """
         if not self.peek(TokenType.LBRACE):
             self.error("Expected '{' to start block")
-            return Block([])
+            return self._block([])
 
         self.eat(TokenType.LBRACE)
         statements = []
+        append = statements.append
+        parse_statement = self.parse_statement
         
-        while not self.peek(TokenType.RBRACE) and not self.peek(TokenType.EOF):
-            statements.append(self.parse_statement())
+        types = self.types
+        RBRACE = TokenType.RBRACE
+        EOF = TokenType.EOF
+        while types[self.i] is not RBRACE and types[self.i] is not EOF:
+            append(parse_statement())
         
         self.eat(TokenType.RBRACE)
-        return Block(statements)
+        return self._block(statements)
     
     def parse_expression_statement(self) -> ExpressionStatement:
         """expr_stmt → expr ";" """
-        expr = self.parse_expression()
-        self.eat(TokenType.SEMI)
-        return ExpressionStatement(expr)
+        expr = self.parse_expr(ARITHMETIC)
+        if self.types[self.i] is TokenType.SEMI:
+            self.i += 1
+        else:
+            self.eat(TokenType.SEMI)
+        return self._expression_statement(expr)
     
 # parser.py (continued)
 
     def parse_statement(self) -> Statement:
         """statement → var_decl | assignment | if_stmt | while_stmt 
                      | func_decl | return_stmt | expr_stmt """
-        
-        if self.peek(TokenType.VAR):
-            return self.parse_var_declaration()
-        
-        elif self.peek(TokenType.IF):
-            return self.parse_if_statement()
-        
-        elif self.peek(TokenType.WHILE):
-            return self.parse_while_statement()
-        
-        elif self.peek(TokenType.DEF):
-            return self.parse_function_declaration()
-        
-        elif self.peek(TokenType.RETURN):
-            return self.parse_return_statement()
-        
-        elif self.peek(TokenType.ID):
-            if self.peek_ahead().type == TokenType.ASSIGN:
-                return self.parse_assignment()
-            else:
-                return self.parse_expression_statement()
-            
-        elif self.peek(TokenType.ELSE):
-            self.error("Unexpected 'else' without matching 'if'")
-            self.eat(TokenType.ELSE)
-            return ExpressionStatement(IntegerLiteral(0))
-        
-        else:
-            return self.parse_expression_statement()
+        handler = self._stmt_dispatch.get(self.types[self.i])
+        if handler is not None:
+            return handler()
+        return self.parse_expression_statement()
+    
+    def _parse_id_statement(self) -> Statement:
+        if self.types[self.i + 1] is TokenType.ASSIGN:
+            return self.parse_assignment()
+        return self.parse_expression_statement()
+    
+    def _parse_stray_else(self) -> Statement:
+        self.error("Unexpected 'else' without matching 'if'")
+        self.eat(TokenType.ELSE)
+        return self._expression_statement(self._int(0))
     
     def parse_program(self) -> Program:
         """program → statement* """
         statements = []
+        append = statements.append
+        parse_statement = self.parse_statement
         
-        while self.current_token and self.current_token.type != TokenType.EOF:
-            statements.append(self.parse_statement())
+        types = self.types
+        EOF = TokenType.EOF
+        while types[self.i] is not None and types[self.i] is not EOF:
+            append(parse_statement())
         
-        return Program(statements)
+        return self._program(statements)
     
     def parse(self) -> Program:
         """Main entry point: parse tokens into AST"""
-        ast = self.parse_program()
+        try:
+            ast = self.parse_program()
+        finally:
+            self.report_errors()
         
         if self.had_error:
             print("\n⚠️  Parsing completed with errors")
@@ -376,4 +462,93 @@ class Parser:
             print("✅ Parsing successful")
         
         return ast
+
+
+class ArenaParser(Parser):
+    """Parser that emits nodes straight into an ast_soa.ASTArena.
+    
+    Every parse_* method returns an arena handle instead of a node, and
+    parse() returns the arena with its root set. Nodes are added as soon
+    as their children are parsed, so handles come out bottom-up as
+    ASTArena requires. No object AST is built.
+    """
+    
+    def __init__(self, lexer: Lexer, tokens: list = None):
+        super().__init__(lexer, tokens)
+        self.arena = ASTArena()
+    
+    def parse_expr(self, rbp: int = CONDITION) -> int:
+        """expr → factor (op expr)*, taking each op that binds tighter than rbp"""
+        node = self.parse_factor()
+        
+        add = self.arena.add
+        types = self.types
+        binding_power = _LBP.get
+        lbp = binding_power(types[self.i], 0)
+        while lbp > rbp:
+            op = self.values[self.i]
+            self.i += 1
+            right = self.parse_expr(lbp)
+            node = add(NodeKind.BINOP, node, OP_CODES[op], right)
+            lbp = binding_power(types[self.i], 0)
+        
+        return node
+    
+    def _int(self, value):
+        arena = self.arena
+        return arena.add(NodeKind.INT, arena.add_literal(value))
+    
+    def _float(self, value):
+        arena = self.arena
+        return arena.add(NodeKind.FLOAT, arena.add_literal(value))
+    
+    def _string(self, value):
+        arena = self.arena
+        return arena.add(NodeKind.STRING, arena.intern(value))
+    
+    def _identifier(self, name):
+        arena = self.arena
+        return arena.add(NodeKind.IDENT, arena.intern(name))
+    
+    def _unary(self, op, expr):
+        return self.arena.add(NodeKind.UNARY, OP_CODES[op], expr)
+    
+    def _call(self, func_name, arguments):
+        arena = self.arena
+        return arena.add(NodeKind.CALL, arena.intern(func_name), *arena.add_items(arguments))
+    
+    def _var_declaration(self, var_name, value):
+        arena = self.arena
+        return arena.add(NodeKind.VAR_DECL, arena.intern(var_name), value)
+    
+    def _assignment(self, var_name, value):
+        arena = self.arena
+        return arena.add(NodeKind.ASSIGN, arena.intern(var_name), value)
+    
+    def _if(self, condition, then_block, else_block):
+        if else_block is None:
+            else_block = -1
+        return self.arena.add(NodeKind.IF, condition, then_block, else_block)
+    
+    def _while(self, condition, body):
+        return self.arena.add(NodeKind.WHILE, condition, body)
+    
+    def _function(self, func_name, params, body):
+        arena = self.arena
+        start, count = arena.add_items(arena.intern(param) for param in params)
+        return arena.add(NodeKind.FUNC, arena.intern(func_name), start, count, body)
+    
+    def _return(self, value):
+        return self.arena.add(NodeKind.RETURN, value)
+    
+    def _block(self, statements):
+        arena = self.arena
+        return arena.add(NodeKind.BLOCK, *arena.add_items(statements))
+    
+    def _expression_statement(self, expression):
+        return self.arena.add(NodeKind.EXPR_STMT, expression)
     
+    def _program(self, statements):
+        arena = self.arena
+        arena.root = arena.add(NodeKind.PROGRAM, *arena.add_items(statements))
+        return arena
@@ -0,0 +1,24 @@
+"""Build the optional C bytecode interpreter:
+
+    python setup.py build_ext --inplace
+"""
+import os
+import sys
+
+# This project's ast.py would shadow the standard library module that
+# setuptools imports, so drop the project directory from the path first
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != here]
+
+from setuptools import Extension, setup
+
+setup(
+    name='minipy_vm',
+    ext_modules=[
+        Extension(
+            'minipy_vm',
+            ['vm.c'],
+            extra_compile_args=['-O3', '-fno-crossjumping'],
+        ),
+    ],
+)
@@ -18,4 +18,51 @@ print(f"  StringLiteral: {str_lit}")
 print(f"  Identifier: {id_node}")
 print(f"  BinaryOp: {binary_op}")
 print(f"  VarDeclaration: {var_decl}")
-print(f"  IfStatement: {if_stmt}")
\ No newline at end of file
+print(f"  IfStatement: {if_stmt}")
+
+# ============ FLATTENED TRAVERSAL ============
+program = Program([
+    VarDeclaration("a", BinaryOp(Identifier("b"), "*", IntegerLiteral(2))),
+    ExpressionStatement(Identifier("a")),
+])
+flat = program.flatten()
+print("\nFlattened program (post-order):")
+for node in flat:
+    print(f"  {type(node).__name__}")
+
+names = [type(node).__name__ for node in flat]
+assert names == ['Identifier', 'IntegerLiteral', 'BinaryOp', 'VarDeclaration',
+                 'Identifier', 'ExpressionStatement', 'Program'], names
+assert program.flatten() is flat
+assert [node.name for node in program.nodes_of(Identifier)] == ['b', 'a']
+assert program.nodes_of(WhileStatement) == []
+
+# The cache is stale until invalidate() is called
+program.statements.append(ReturnStatement(IntegerLiteral(0)))
+assert program.nodes_of(ReturnStatement) == []
+program.invalidate()
+assert len(program.nodes_of(ReturnStatement)) == 1
+assert len(program.flatten()) == len(flat) + 2
+
+# A node shared by two parents is listed once
+shared = Identifier("s")
+program = Program([ExpressionStatement(BinaryOp(shared, "+", shared))])
+assert program.nodes_of(Identifier) == [shared]
+assert len(program.flatten()) == 4
+print("✅ flatten, nodes_of and invalidate")
+
+# ============ INTERNED LITERALS ============
+assert IntegerLiteral(1) is IntegerLiteral(1)
+assert IntegerLiteral(-128) is IntegerLiteral(-128)
+assert IntegerLiteral(257) is not IntegerLiteral(257)
+assert IntegerLiteral(1) is not IntegerLiteral(True)
+
+# A literal used twice is one shared node, so flatten lists it once
+one = IntegerLiteral(1)
+program = Program([
+    VarDeclaration("a", IntegerLiteral(1)),
+    VarDeclaration("b", BinaryOp(Identifier("a"), "+", IntegerLiteral(1))),
+])
+assert program.nodes_of(IntegerLiteral) == [one]
+assert len(program.flatten()) == 6
+print("✅ Small IntegerLiterals are interned and listed once")
@@ -0,0 +1,53 @@
+# test_ast_soa.py - object AST <-> ASTArena round trip
+from lexer import Lexer
+from parser import Parser
+from ast_soa import ASTArena, NodeKind
+
+test_code = """
+var x = 10;
+var rate = 2.5;
+var name = "mini";
+def scale(a, b) {
+    return a * b + -rate;
+}
+if (x > 5 && x != 7) {
+    x = scale(x, 2);
+} else {
+    print(name, x);
+}
+while (x < 100) {
+    x = x + 1;
+}
+"""
+
+program = Parser(Lexer(test_code)).parse()
+arena = ASTArena.from_program(program)
+print(f"Arena: {len(arena)} nodes, {len(arena.strings)} strings, "
+      f"{len(arena.literals)} numeric literals")
+print(f"Kinds: {sorted(NodeKind(kind).name for kind in set(arena.kind))}")
+
+# Converting back gives the same tree
+tree = arena.to_tree()
+assert repr(tree) == repr(program), repr(tree)
+
+# Children are added before their parents, the root last
+CHILDREN = {
+    NodeKind.BINOP: ('left', 'right'),
+    NodeKind.UNARY: ('expr',),
+    NodeKind.VAR_DECL: ('value',),
+    NodeKind.ASSIGN: ('value',),
+    NodeKind.IF: ('condition', 'then_block', 'else_block'),
+    NodeKind.WHILE: ('condition', 'body'),
+    NodeKind.FUNC: ('body',),
+    NodeKind.RETURN: ('value',),
+    NodeKind.EXPR_STMT: ('expression',),
+}
+for handle in range(len(arena)):
+    for name in CHILDREN.get(arena.kind[handle], ()):
+        assert arena.field(handle, name) < handle, (handle, name)
+assert arena.root == len(arena) - 1
+
+# Names and string literals are stored once
+assert arena.strings.count('x') == 1
+assert len(arena.strings) == len(set(arena.strings))
+print("✅ ASTArena.from_program / to_tree round trip")
@@ -0,0 +1,49 @@
+from lexer import Lexer
+from parser import Parser
+from bytecode import compile_program, disassemble
+import vm
+import vm_py
+
+test_code = """
+var total = 0;
+var i = 1;
+while (i <= 10) {
+    total = total + i;
+    i = i + 1;
+}
+print("total:", total);
+
+def fact(n) {
+    if (n <= 1) {
+        return 1;
+    }
+    return n * fact(n - 1);
+}
+print("fact(10):", fact(10));
+
+def half(x) {
+    var h = x / 2;
+    return h;
+}
+var msg = "big";
+if (half(total) < 20) {
+    msg = "small";
+}
+print(msg, -half(3));
+"""
+
+program = Parser(Lexer(test_code)).parse()
+code = compile_program(program)
+
+print("=== Bytecode ===")
+print(disassemble(code))
+
+print("\n=== Pure-Python VM ===")
+vm_py.execute(code, [], [vm_py.BUILTINS.get(name, vm_py.UNDEFINED)
+                         for name in code.global_names])
+
+if vm.minipy_vm is not None:
+    print("\n=== C VM ===")
+    vm.run(code)
+else:
+    print("\n(minipy_vm extension not built, skipping C VM)")
@@ -0,0 +1,69 @@
+# Alternative lexers must produce exactly Lexer's tokens
+from lexer import Lexer
+import lexer_hs
+import lexer_numba
+from lexer_hs import FastLexer
+from lexer_numba import NumbaLexer
+
+SAMPLES = [
+    """
+var x = 10;
+var y = x + 20;
+if (x > 5) {
+    print("x is greater than 5");
+} else {
+    print("x is 5 or less");
+}
+while (y < 100) {
+    y = y + 10;
+}
+def add(a, b) {
+    return a + b;
+}
+""",
+    """
+# Comments, floats and operators
+var pi = 3.14;   # trailing comment
+var half = 1.;
+if (pi >= 3 && half <= 1 || pi != half) {
+    msg = "multi
+line";
+}
+print(-pi * 2 / half == 0);
+""",
+    "x;",
+    "x;\n",
+    "",
+    "# only a comment\n",
+]
+
+# Inputs every lexer must reject with the same message
+BAD = ['var x = 1 @ 2;', 'a = !b;', 'x = "unterminated\n;']
+
+
+def tokens(lexer_class, text):
+    """(type, value, line, column) of every token, or the error message"""
+    try:
+        return [(t.type, t.value, t.line, t.column)
+                for t in lexer_class(text).tokenize()]
+    except Exception as e:
+        return str(e)
+
+
+def check(name, lexer_class):
+    for text in SAMPLES + BAD:
+        expected = tokens(Lexer, text)
+        actual = tokens(lexer_class, text)
+        assert actual == expected, (name, text, actual, expected)
+    print(f"✅ {name} matches Lexer on {len(SAMPLES) + len(BAD)} inputs")
+
+
+if lexer_hs.DATABASE is not None:
+    check("FastLexer", FastLexer)
+else:
+    print("(hyperscan not installed, skipping FastLexer)")
+
+if lexer_numba.np is not None:
+    check("NumbaLexer", NumbaLexer)
+else:
+    print("(numba not available, skipping NumbaLexer)")
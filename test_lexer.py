@@ -0,0 +1,41 @@
+from lexer import Lexer, TokenType
+
+test_code = "<= >= < > == != = && ||"
+
+print("=== Operators ===")
+tokens = Lexer(test_code).tokenize()
+for token in tokens:
+    print(token)
+
+# Two-character operators must not be split into their prefixes
+types = [token.type for token in Lexer('<= >= <').tokenize()]
+assert types == [TokenType.LTE, TokenType.GTE, TokenType.LT, TokenType.EOF], types
+print("\n✅ <= >= < lexed as LTE GTE LT")
+
+def positions(text):
+    """(line, column) of every token of text, EOF included"""
+    return [(token.line, token.column) for token in Lexer(text).tokenize()]
+
+def error(text):
+    """Message of the lexer error raised for text"""
+    try:
+        Lexer(text).tokenize()
+    except Exception as e:
+        return str(e)
+    return None
+
+print("\n=== Positions ===")
+for text in ['x;', 'x;\n', 's = "a\nb"; y']:
+    print(repr(text), positions(text))
+
+# EOF sits just past the last character, or at column 1 of the line
+# after a trailing newline
+assert positions('x;') == [(1, 1), (1, 2), (1, 3)], positions('x;')
+assert positions('x;\n') == [(1, 1), (1, 2), (2, 1)], positions('x;\n')
+assert positions('') == [(1, 1)], positions('')
+# A string spanning lines is placed where it starts
+assert positions('s = "a\nb"; y') == [(1, 1), (1, 3), (1, 5), (2, 3), (2, 5), (2, 6)]
+# Errors point at the offending character, or at the opening quote
+assert error('a\n  !x') == "Lexer error at line 2, column 3: Unexpected character: !"
+assert error('x "ab\ncd') == "Lexer error at line 1, column 3: Unterminated string"
+print("\n✅ EOF, multi-line string and error positions")
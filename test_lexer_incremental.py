@@ -0,0 +1,54 @@
+# Re-lexing after an edit must give exactly the tokens of a fresh Lexer
+from lexer import Lexer
+from lexer_incremental import IncrementalLexer
+from main import relex
+
+def tokens(lexer):
+    return [(t.type, t.value, t.line, t.column) for t in lexer.tokenize()]
+
+def edit(text, start, old_end, replacement):
+    """Apply an edit to text; return the new text and its (start, old_end, new_end)"""
+    new_text = text[:start] + replacement + text[old_end:]
+    return new_text, (start, old_end, start + len(replacement))
+
+text = """var x = 10;
+var y = x + 20;
+if (x > 5) {
+    print("big");
+}
+"""
+
+# (description, start, old_end, replacement)
+EDITS = [
+    ("insert inside an identifier", 5, 5, "yz"),
+    ("insert a new statement", 12, 12, "var z = 1;"),
+    ("delete part of a line", 20, 24, ""),
+    ("splice a newline into a line", 4, 4, "\n"),
+    ("join two lines", 11, 12, " "),
+    ("replace across lines", 8, 30, "3;\nvar w = "),
+    ("append at the end", 10_000, 10_000, "x = 2;\n"),
+]
+
+print("=== Incremental re-lexing ===")
+lexer = IncrementalLexer(text)
+assert tokens(lexer) == tokens(Lexer(text))
+for description, start, old_end, replacement in EDITS:
+    start, old_end = min(start, len(text)), min(old_end, len(text))
+    text, change = edit(text, start, old_end, replacement)
+    lexer = relex(text, lexer, change)
+    assert lexer is not None, description
+    assert tokens(lexer) == tokens(Lexer(text)), description
+    print(f"✅ {description}")
+
+# An edit that opens a string leaves the input unlexable for now ...
+start = text.index("big")
+broken, change = edit(text, start, start, '"')
+assert relex(broken, lexer, change) is None
+print("✅ unterminated string returns None")
+
+# ... and the next complete text is lexed from scratch
+start = broken.index('"big"') + 1
+fixed, change = edit(broken, start, start, '"')
+lexer = relex(fixed, None, change)
+assert tokens(lexer) == tokens(Lexer(fixed))
+print("✅ lexing resumes once the string is closed")
@@ -0,0 +1,50 @@
+from lexer import Lexer
+from parser import Parser
+from ast import VarDeclaration, BinaryOp, IntegerLiteral
+from optimizer import FusedOptimizer
+from visitor import PrintVisitor
+
+test_code = """
+var x = 10 + 5 * 2;
+var y = x * 1 + 0;
+var s = "mini" + "python";
+var z = -(4 / 2) + y;
+if (3 > 1) {
+    print("always");
+} else {
+    print("never");
+}
+while (0) {
+    x = x + 1;
+}
+var bad = "a" - 1;
+"""
+
+ast = Parser(Lexer(test_code)).parse()
+optimizer = FusedOptimizer()
+optimized = optimizer.visit(ast)
+
+print("=== Optimized AST ===")
+optimized.accept(PrintVisitor())
+
+print("\n=== Types ===")
+for stmt in optimized.statements:
+    if isinstance(stmt, VarDeclaration):
+        print(f"{stmt.var_name}: {optimizer.types.get(stmt.value, 'unknown')}")
+
+print("\n=== Type errors ===")
+for error in optimizer.type_errors:
+    print(error)
+
+# x + 0 and x * 1 are rewritten to x only when x is known to be a number
+identity = Parser(Lexer("""
+var n = 7 * 1 + 0;
+var s = "text";
+var t = s + 0;
+var u = 1 * s;
+""")).parse()
+n, _, t, u = FusedOptimizer().visit(identity).statements
+assert isinstance(n.value, IntegerLiteral) and n.value.value == 7
+assert isinstance(t.value, BinaryOp) and t.value.op == '+'
+assert isinstance(u.value, BinaryOp) and u.value.op == '*'
+print("\n✅ Identity rules skip operands not known to be numeric")
@@ -1,8 +1,11 @@
 # test_visitor.py - FIXED VERSION
 
+import contextlib
+import io
+
 from lexer import Lexer
-from parser import Parser
-from visitor import PrintVisitor
+from parser import Parser, ArenaParser, tokenize
+from visitor import PrintVisitor, print_arena
 
 test_code = """
 var x = 10;
@@ -24,14 +27,13 @@ print("=== Source Code ===")
 print(test_code)
 
 print("\n=== Lexing ===")
-lexer1 = Lexer(test_code)  # First lexer for token display
-tokens = lexer1.tokenize()
+lexer = Lexer(test_code)  # One lexer for display and parsing
+tokens = tokenize(lexer)
 for token in tokens[:10]:  # Show first 10 tokens
     print(token)
 
 print("\n=== Parsing ===")
-lexer2 = Lexer(test_code)  # FRESH lexer for parser
-parser = Parser(lexer2)
+parser = Parser.from_tokens(tokens, test_code)  # No second lexing pass
 ast = parser.parse()
 print(f"Parsed successfully! {len(ast.statements)} statements")
 
@@ -39,4 +41,22 @@ print("\n=== AST Structure (Visitor Output) ===")
 print("=" * 50)
 visitor = PrintVisitor()
 ast.accept(visitor)
-print("=" * 50)
\ No newline at end of file
+print("=" * 50)
+
+# The flat arena AST must print exactly like the object AST
+expected = io.StringIO()
+with contextlib.redirect_stdout(expected):
+    ast.accept(PrintVisitor())
+arena = ArenaParser.from_tokens(tokens, test_code).parse()
+flat = io.StringIO()
+with contextlib.redirect_stdout(flat):
+    print_arena(arena)
+assert flat.getvalue() == expected.getvalue(), flat.getvalue()
+print(f"\n✅ ArenaParser + print_arena match PrintVisitor ({len(arena)} nodes)")
+
+# Visiting a single statement prints its subtree as well, not just a Program
+stmt_out = io.StringIO()
+with contextlib.redirect_stdout(stmt_out):
+    ast.statements[0].accept(PrintVisitor())
+assert stmt_out.getvalue() == "VarDeclaration: x\n  Value:\n    IntegerLiteral: 10\n", stmt_out.getvalue()
+print("✅ Statement-level accept prints its subtree")
@@ -1,9 +1,44 @@
+import sys
 from abc import ABC, abstractmethod
 from ast import *
+from ast_soa import ASTArena, NodeKind, OPERATORS
+
+# Node class -> name of the visitor method that handles it
+_VISIT_METHODS = {
+    Program: 'visit_program',
+    VarDeclaration: 'visit_var_declaration',
+    Assignment: 'visit_assignment',
+    IfStatement: 'visit_if_statement',
+    WhileStatement: 'visit_while_statement',
+    FunctionDeclaration: 'visit_function_declaration',
+    ReturnStatement: 'visit_return_statement',
+    ExpressionStatement: 'visit_expression_statement',
+    Block: 'visit_block',
+    BinaryOp: 'visit_binary_op',
+    UnaryOp: 'visit_unary_op',
+    CallExpression: 'visit_call_expression',
+    Identifier: 'visit_identifier',
+    Literal: 'visit_literal',
+    IntegerLiteral: 'visit_literal',
+    FloatLiteral: 'visit_literal',
+    StringLiteral: 'visit_literal',
+}
+
 
 class ASTVisitor(ABC):
     """Abstract visitor interface for AST nodes"""
     
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Node class -> this class's visit_* function, built once per
+        # visitor class and called as handler(self, node)
+        cls._DISPATCH = {node_cls: getattr(cls, name)
+                         for node_cls, name in _VISIT_METHODS.items()}
+    
+    def visit(self, node: ASTNode):
+        """Dispatch node to its visit_* method"""
+        return self._DISPATCH[type(node)](self, node)
+    
     @abstractmethod
     def visit_program(self, node: Program):
         pass
@@ -63,148 +98,200 @@ class ASTVisitor(ABC):
 
 # visitor.py (continued)
 
+# Indentation prefix per level, so PrintVisitor doesn't rebuild it per line
+_INDENTS = tuple("  " * level for level in range(64))
+
 class PrintVisitor(ASTVisitor):
-    """Visitor that prints AST structure with indentation"""
+    """Visitor that prints AST structure with indentation.
+    
+    The tree is walked iteratively with an explicit stack, so deep
+    nesting costs no Python frames. Lines are collected in a buffer and
+    written to stdout in one call when the visit returns.
+    """
     
     def __init__(self):
+        super().__init__()
         self.indent_level = 0
+        self._out = []
     
-    def _indent(self):
-        return "  " * self.indent_level
+    def flush(self):
+        """Write the buffered lines to stdout"""
+        if self._out:
+            sys.stdout.write(''.join(self._out))
+            self._out.clear()
     
-    def _print(self, text):
-        print(f"{self._indent()}{text}")
-    
-    def visit_program(self, node: Program):
-        self._print("Program:")
-        self.indent_level += 1
-        for stmt in node.statements:
-            stmt.accept(self)
-        self.indent_level -= 1
-    
-    def visit_var_declaration(self, node: VarDeclaration):
-        self._print(f"VarDeclaration: {node.var_name}")
-        self.indent_level += 1
-        self._print("Value:")
-        self.indent_level += 1
-        node.value.accept(self)
-        self.indent_level -= 2
-    
-    def visit_assignment(self, node: Assignment):
-        self._print(f"Assignment: {node.var_name}")
-        self.indent_level += 1
-        self._print("Value:")
-        self.indent_level += 1
-        node.value.accept(self)
-        self.indent_level -= 2
-    
-    def visit_if_statement(self, node: IfStatement):
-        self._print("IfStatement:")
-        self.indent_level += 1
-        
-        self._print("Condition:")
-        self.indent_level += 1
-        node.condition.accept(self)
-        self.indent_level -= 1
+    def _print_tree(self, root: ASTNode):
+        """Print root and its subtree, starting at the current indent level"""
+        out = self._out
+        # (indent level, node, label printed one level up before the node
+        # or None). A node's first label goes out with its header line;
+        # children are pushed last-first so they pop in source order.
+        stack = [(self.indent_level, root, None)]
+        pop = stack.pop
+        push = stack.append
         
-        self._print("Then:")
-        self.indent_level += 1
-        node.then_block.accept(self)
-        self.indent_level -= 1
-        
-        if node.else_block:
-            self._print("Else:")
-            self.indent_level += 1
-            node.else_block.accept(self)
-            self.indent_level -= 1
-        
-        self.indent_level -= 1
+        while stack:
+            level, node, label = pop()
+            try:
+                indent = _INDENTS[level]
+            except IndexError:
+                indent = "  " * level
+            if label is not None:
+                out.append(f"{indent[2:]}{label}\n")
+            
+            cls = type(node)
+            if cls is BinaryOp:
+                out.append(f"{indent}BinaryOp: {node.op}\n{indent}  Left:\n")
+                push((level + 2, node.right, "Right:"))
+                push((level + 2, node.left, None))
+            elif cls is Identifier:
+                out.append(f"{indent}Identifier: {node.name}\n")
+            elif isinstance(node, Literal):
+                out.append(f"{indent}{node.type_name}Literal: {node.value}\n")
+            elif cls is UnaryOp:
+                out.append(f"{indent}UnaryOp: {node.op}\n")
+                push((level + 1, node.expr, None))
+            elif cls is CallExpression:
+                if node.arguments:
+                    out.append(f"{indent}CallExpression: {node.func_name}\n{indent}  Arguments:\n")
+                    for arg in reversed(node.arguments):
+                        push((level + 2, arg, None))
+                else:
+                    out.append(f"{indent}CallExpression: {node.func_name}\n")
+            elif cls is Program or cls is Block:
+                out.append(f"{indent}{cls.__name__}:\n")
+                for stmt in reversed(node.statements):
+                    push((level + 1, stmt, None))
+            elif cls is VarDeclaration or cls is Assignment:
+                out.append(f"{indent}{cls.__name__}: {node.var_name}\n{indent}  Value:\n")
+                push((level + 2, node.value, None))
+            elif cls is IfStatement:
+                out.append(f"{indent}IfStatement:\n{indent}  Condition:\n")
+                if node.else_block:
+                    push((level + 2, node.else_block, "Else:"))
+                push((level + 2, node.then_block, "Then:"))
+                push((level + 2, node.condition, None))
+            elif cls is WhileStatement:
+                out.append(f"{indent}WhileStatement:\n{indent}  Condition:\n")
+                push((level + 2, node.body, "Body:"))
+                push((level + 2, node.condition, None))
+            elif cls is FunctionDeclaration:
+                out.append(f"{indent}FunctionDeclaration: {node.func_name}\n"
+                           f"{indent}  Parameters: {', '.join(node.params)}\n"
+                           f"{indent}  Body:\n")
+                push((level + 2, node.body, None))
+            elif cls is ReturnStatement:
+                out.append(f"{indent}ReturnStatement:\n")
+                push((level + 1, node.value, None))
+            else:
+                out.append(f"{indent}ExpressionStatement:\n")
+                push((level + 1, node.expression, None))
     
-    def visit_while_statement(self, node: WhileStatement):
-        self._print("WhileStatement:")
-        self.indent_level += 1
-        
-        self._print("Condition:")
-        self.indent_level += 1
-        node.condition.accept(self)
-        self.indent_level -= 1
-        
-        self._print("Body:")
-        self.indent_level += 1
-        node.body.accept(self)
-        self.indent_level -= 1
-        
-        self.indent_level -= 1
+    def _print_root(self, node: ASTNode):
+        """Print the subtree under node and write it out"""
+        try:
+            self._print_tree(node)
+        finally:
+            self.flush()
     
-    def visit_function_declaration(self, node: FunctionDeclaration):
-        self._print(f"FunctionDeclaration: {node.func_name}")
-        self.indent_level += 1
-        
-        self._print(f"Parameters: {', '.join(node.params)}")
-        
-        self._print("Body:")
-        self.indent_level += 1
-        node.body.accept(self)
-        self.indent_level -= 1
-        
-        self.indent_level -= 1
-    
-    def visit_return_statement(self, node: ReturnStatement):
-        self._print("ReturnStatement:")
-        self.indent_level += 1
-        node.value.accept(self)
-        self.indent_level -= 1
-    
-    def visit_expression_statement(self, node: ExpressionStatement):
-        self._print("ExpressionStatement:")
-        self.indent_level += 1
-        node.expression.accept(self)
-        self.indent_level -= 1
-    
-    def visit_block(self, node: Block):
-        self._print("Block:")
-        self.indent_level += 1
-        for stmt in node.statements:
-            stmt.accept(self)
-        self.indent_level -= 1
-    
-    def visit_binary_op(self, node: BinaryOp):
-        self._print(f"BinaryOp: {node.op}")
-        self.indent_level += 1
-        
-        self._print("Left:")
-        self.indent_level += 1
-        node.left.accept(self)
-        self.indent_level -= 1
-        
-        self._print("Right:")
-        self.indent_level += 1
-        node.right.accept(self)
-        self.indent_level -= 1
-        
-        self.indent_level -= 1
+    # Any node can be the root of a print; each goes through the same
+    # iterative walk and writes its lines when done
+    visit_program = _print_root
+    visit_var_declaration = visit_assignment = _print_root
+    visit_if_statement = visit_while_statement = _print_root
+    visit_function_declaration = visit_return_statement = _print_root
+    visit_expression_statement = visit_block = _print_root
+    visit_binary_op = visit_unary_op = visit_call_expression = _print_root
+    visit_identifier = visit_literal = _print_root
+
+
+# NodeKind values as plain ints for print_arena's comparisons
+(_PROGRAM, _BLOCK, _VAR_DECL, _ASSIGN, _IF, _WHILE, _FUNC, _RETURN, _EXPR_STMT,
+ _BINOP, _UNARY, _CALL, _IDENT, _INT, _FLOAT, _STRING) = map(int, NodeKind)
+
+def print_arena(arena: ASTArena):
+    """Print an ASTArena in PrintVisitor's format, iterating by handle.
     
-    def visit_unary_op(self, node: UnaryOp):
-        self._print(f"UnaryOp: {node.op}")
-        self.indent_level += 1
-        node.expr.accept(self)
-        self.indent_level -= 1
+    The tree is walked with an explicit stack of (indent level, handle,
+    label), as in PrintVisitor, so there is no recursion and no node
+    objects are built.
+    """
+    kinds = arena.kind
+    slots = arena.slot
+    columns = arena.columns
+    items = arena.items
+    strings = arena.strings
+    literals = arena.literals
+    out = []
+    stack = [(0, arena.root, None)]
+    pop = stack.pop
+    push = stack.append
     
-    def visit_call_expression(self, node: CallExpression):
-        self._print(f"CallExpression: {node.func_name}")
-        self.indent_level += 1
-        
-        if node.arguments:
-            self._print("Arguments:")
-            self.indent_level += 1
-            for arg in node.arguments:
-                arg.accept(self)
-            self.indent_level -= 1
+    while stack:
+        level, handle, label = pop()
+        try:
+            indent = _INDENTS[level]
+        except IndexError:
+            indent = "  " * level
+        if label is not None:
+            out.append(f"{indent[2:]}{label}\n")
         
-        self.indent_level -= 1
+        kind = kinds[handle]
+        slot = slots[handle]
+        c = [column[slot] for column in columns[kind]]
+        # A node's first label goes out with its header line; children are
+        # pushed last-first so they pop in source order
+        if kind == _BINOP:
+            out.append(f"{indent}BinaryOp: {OPERATORS[c[1]]}\n{indent}  Left:\n")
+            push((level + 2, c[2], "Right:"))
+            push((level + 2, c[0], None))
+        elif kind == _IDENT:
+            out.append(f"{indent}Identifier: {strings[c[0]]}\n")
+        elif kind == _INT:
+            out.append(f"{indent}IntegerLiteral: {literals[c[0]]}\n")
+        elif kind == _FLOAT:
+            out.append(f"{indent}FloatLiteral: {literals[c[0]]}\n")
+        elif kind == _STRING:
+            out.append(f"{indent}StringLiteral: {strings[c[0]]}\n")
+        elif kind == _UNARY:
+            out.append(f"{indent}UnaryOp: {OPERATORS[c[0]]}\n")
+            push((level + 1, c[1], None))
+        elif kind == _CALL:
+            if c[2]:
+                out.append(f"{indent}CallExpression: {strings[c[0]]}\n{indent}  Arguments:\n")
+                for arg in reversed(items[c[1]:c[1] + c[2]]):
+                    push((level + 2, arg, None))
+            else:
+                out.append(f"{indent}CallExpression: {strings[c[0]]}\n")
+        elif kind == _PROGRAM or kind == _BLOCK:
+            out.append(f"{indent}{'Program' if kind == _PROGRAM else 'Block'}:\n")
+            for stmt in reversed(items[c[0]:c[0] + c[1]]):
+                push((level + 1, stmt, None))
+        elif kind == _VAR_DECL or kind == _ASSIGN:
+            name = 'VarDeclaration' if kind == _VAR_DECL else 'Assignment'
+            out.append(f"{indent}{name}: {strings[c[0]]}\n{indent}  Value:\n")
+            push((level + 2, c[1], None))
+        elif kind == _IF:
+            out.append(f"{indent}IfStatement:\n{indent}  Condition:\n")
+            if c[2] >= 0:
+                push((level + 2, c[2], "Else:"))
+            push((level + 2, c[1], "Then:"))
+            push((level + 2, c[0], None))
+        elif kind == _WHILE:
+            out.append(f"{indent}WhileStatement:\n{indent}  Condition:\n")
+            push((level + 2, c[1], "Body:"))
+            push((level + 2, c[0], None))
+        elif kind == _FUNC:
+            params = ', '.join(strings[i] for i in items[c[1]:c[1] + c[2]])
+            out.append(f"{indent}FunctionDeclaration: {strings[c[0]]}\n"
+                       f"{indent}  Parameters: {params}\n"
+                       f"{indent}  Body:\n")
+            push((level + 2, c[3], None))
+        elif kind == _RETURN:
+            out.append(f"{indent}ReturnStatement:\n")
+            push((level + 1, c[0], None))
+        else:
+            out.append(f"{indent}ExpressionStatement:\n")
+            push((level + 1, c[0], None))
     
-    def visit_identifier(self, node: Identifier):
-        self._print(f"Identifier: {node.name}")
-    
-    def visit_literal(self, node: Literal):
-        self._print(f"{node.type_name}Literal: {node.value}")
\ No newline at end of file
+    sys.stdout.write(''.join(out))
@@ -0,0 +1,395 @@
+/*
+ * minipy_vm: threaded-dispatch interpreter for MiniPython bytecode.
+ *
+ * Executes the code objects produced by bytecode.py. With GCC/Clang each
+ * handler jumps straight to the next one through a label table
+ * (computed goto), so there is no central dispatch branch; other
+ * compilers get an equivalent switch loop.
+ *
+ * Values are Python objects, so arithmetic, comparisons and builtins
+ * behave exactly as in the pure-Python VM (vm_py.py).
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+#if PY_VERSION_HEX < 0x03090000
+#define PyObject_Vectorcall _PyObject_Vectorcall
+#endif
+
+#if defined(__GNUC__) || defined(__clang__)
+#define USE_COMPUTED_GOTO 1
+#endif
+
+/* Must match bytecode.OpCode */
+enum {
+    OP_CONST = 1,
+    OP_LOAD,
+    OP_STORE,
+    OP_LOAD_GLOBAL,
+    OP_STORE_GLOBAL,
+    OP_ADD,
+    OP_SUB,
+    OP_MUL,
+    OP_DIV,
+    OP_EQ,
+    OP_NEQ,
+    OP_LT,
+    OP_GT,
+    OP_LTE,
+    OP_GTE,
+    OP_AND,
+    OP_OR,
+    OP_NEG,
+    OP_JMP,
+    OP_JZ,
+    OP_CALL,
+    OP_RET,
+    OP_POP,
+};
+
+typedef struct {
+    PyObject *globals;    /* list, one slot per global name */
+    PyObject *code_type;  /* bytecode.CodeObject */
+    PyObject *undefined;  /* marker for unassigned globals */
+} VMState;
+
+static PyObject *
+name_error(PyObject *code_obj, Py_ssize_t slot)
+{
+    PyObject *names = PyObject_GetAttrString(code_obj, "global_names");
+    if (names != NULL) {
+        PyObject *name = PySequence_GetItem(names, slot);
+        if (name != NULL) {
+            PyErr_Format(PyExc_NameError, "name '%U' is not defined", name);
+            Py_DECREF(name);
+        }
+        Py_DECREF(names);
+    }
+    return NULL;
+}
+
+static int
+get_ssize_attr(PyObject *obj, const char *name, Py_ssize_t *out)
+{
+    PyObject *value = PyObject_GetAttrString(obj, name);
+    if (value == NULL) {
+        return -1;
+    }
+    *out = PyLong_AsSsize_t(value);
+    Py_DECREF(value);
+    return (*out == -1 && PyErr_Occurred()) ? -1 : 0;
+}
+
+static PyObject *
+execute(PyObject *code_obj, PyObject *const *args, Py_ssize_t nargs, VMState *st)
+{
+    PyObject *code = NULL, *consts = NULL, *result = NULL;
+    PyObject **locals = NULL, **stack = NULL, **sp;
+    Py_ssize_t nlocals, nparams, i, code_len;
+    const uint8_t *ip;
+
+#ifdef USE_COMPUTED_GOTO
+    static void *dispatch_table[256] = {
+        [0 ... 255] = &&bad_opcode,
+        [OP_CONST] = &&L_OP_CONST,
+        [OP_LOAD] = &&L_OP_LOAD,
+        [OP_STORE] = &&L_OP_STORE,
+        [OP_LOAD_GLOBAL] = &&L_OP_LOAD_GLOBAL,
+        [OP_STORE_GLOBAL] = &&L_OP_STORE_GLOBAL,
+        [OP_ADD] = &&L_OP_ADD,
+        [OP_SUB] = &&L_OP_SUB,
+        [OP_MUL] = &&L_OP_MUL,
+        [OP_DIV] = &&L_OP_DIV,
+        [OP_EQ] = &&L_OP_EQ,
+        [OP_NEQ] = &&L_OP_NEQ,
+        [OP_LT] = &&L_OP_LT,
+        [OP_GT] = &&L_OP_GT,
+        [OP_LTE] = &&L_OP_LTE,
+        [OP_GTE] = &&L_OP_GTE,
+        [OP_AND] = &&L_OP_AND,
+        [OP_OR] = &&L_OP_OR,
+        [OP_NEG] = &&L_OP_NEG,
+        [OP_JMP] = &&L_OP_JMP,
+        [OP_JZ] = &&L_OP_JZ,
+        [OP_CALL] = &&L_OP_CALL,
+        [OP_RET] = &&L_OP_RET,
+        [OP_POP] = &&L_OP_POP,
+    };
+#define TARGET(op) L_##op:
+#define DISPATCH() goto *dispatch_table[*ip++]
+#else
+#define TARGET(op) case op:
+#define DISPATCH() goto dispatch
+#endif
+
+#define ARG() (ip += 2, (Py_ssize_t)(ip[-2] | (ip[-1] << 8)))
+#define JUMP_ARG() (ip += 2, (Py_ssize_t)(int16_t)(ip[-2] | (ip[-1] << 8)))
+#define PUSH(v) (*sp++ = (v))
+#define POP() (*--sp)
+
+#define BINARY(op, expr)                              \
+    TARGET(op) {                                      \
+        PyObject *b = POP();                          \
+        PyObject *a = POP();                          \
+        PyObject *r = (expr);                         \
+        Py_DECREF(a);                                 \
+        Py_DECREF(b);                                 \
+        if (r == NULL) {                              \
+            goto error;                               \
+        }                                             \
+        PUSH(r);                                      \
+        DISPATCH();                                   \
+    }
+
+#define LOGICAL(op, combine)                          \
+    TARGET(op) {                                      \
+        PyObject *b = POP();                          \
+        PyObject *a = POP();                          \
+        int ta = PyObject_IsTrue(a);                  \
+        int tb = ta < 0 ? -1 : PyObject_IsTrue(b);    \
+        Py_DECREF(a);                                 \
+        Py_DECREF(b);                                 \
+        if (tb < 0) {                                 \
+            goto error;                               \
+        }                                             \
+        PUSH(PyBool_FromLong(ta combine tb));         \
+        DISPATCH();                                   \
+    }
+
+    if (Py_EnterRecursiveCall(" in MiniPython code")) {
+        return NULL;
+    }
+
+    code = PyObject_GetAttrString(code_obj, "code");
+    consts = code ? PyObject_GetAttrString(code_obj, "consts") : NULL;
+    if (consts == NULL
+        || get_ssize_attr(code_obj, "nlocals", &nlocals) < 0
+        || get_ssize_attr(code_obj, "nparams", &nparams) < 0) {
+        goto exit;
+    }
+    if (!PyBytes_Check(code) || !PyTuple_Check(consts)) {
+        PyErr_SetString(PyExc_TypeError, "code must be bytes and consts a tuple");
+        goto exit;
+    }
+    if (nargs != nparams) {
+        PyObject *name = PyObject_GetAttrString(code_obj, "name");
+        if (name != NULL) {
+            PyErr_Format(PyExc_TypeError, "%U() takes %zd arguments (%zd given)",
+                         name, nparams, nargs);
+            Py_DECREF(name);
+        }
+        goto exit;
+    }
+
+    /* Every statement leaves the stack balanced, so its depth never
+       exceeds the number of instructions. */
+    code_len = PyBytes_GET_SIZE(code);
+    locals = PyMem_Calloc(nlocals + 1, sizeof(PyObject *));
+    stack = PyMem_Malloc((code_len + 1) * sizeof(PyObject *));
+    sp = stack;
+    if (locals == NULL || stack == NULL) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+    for (i = 0; i < nargs; i++) {
+        Py_INCREF(args[i]);
+        locals[i] = args[i];
+    }
+    ip = (const uint8_t *)PyBytes_AS_STRING(code);
+
+#ifdef USE_COMPUTED_GOTO
+    DISPATCH();
+#else
+dispatch:
+    switch (*ip++) {
+#endif
+
+    TARGET(OP_CONST) {
+        PyObject *v = PyTuple_GET_ITEM(consts, ARG());
+        Py_INCREF(v);
+        PUSH(v);
+        DISPATCH();
+    }
+
+    TARGET(OP_LOAD) {
+        PyObject *v = locals[ARG()];
+        if (v == NULL) {
+            PyErr_SetString(PyExc_NameError, "local variable referenced before assignment");
+            goto error;
+        }
+        Py_INCREF(v);
+        PUSH(v);
+        DISPATCH();
+    }
+
+    TARGET(OP_STORE) {
+        Py_ssize_t slot = ARG();
+        Py_XSETREF(locals[slot], POP());
+        DISPATCH();
+    }
+
+    TARGET(OP_LOAD_GLOBAL) {
+        Py_ssize_t slot = ARG();
+        PyObject *v = PyList_GET_ITEM(st->globals, slot);
+        if (v == st->undefined) {
+            name_error(code_obj, slot);
+            goto error;
+        }
+        Py_INCREF(v);
+        PUSH(v);
+        DISPATCH();
+    }
+
+    TARGET(OP_STORE_GLOBAL) {
+        Py_ssize_t slot = ARG();
+        PyObject *old = PyList_GET_ITEM(st->globals, slot);
+        PyList_SET_ITEM(st->globals, slot, POP());
+        Py_DECREF(old);
+        DISPATCH();
+    }
+
+    BINARY(OP_ADD, PyNumber_Add(a, b))
+    BINARY(OP_SUB, PyNumber_Subtract(a, b))
+    BINARY(OP_MUL, PyNumber_Multiply(a, b))
+    BINARY(OP_DIV, PyNumber_TrueDivide(a, b))
+    BINARY(OP_EQ, PyObject_RichCompare(a, b, Py_EQ))
+    BINARY(OP_NEQ, PyObject_RichCompare(a, b, Py_NE))
+    BINARY(OP_LT, PyObject_RichCompare(a, b, Py_LT))
+    BINARY(OP_GT, PyObject_RichCompare(a, b, Py_GT))
+    BINARY(OP_LTE, PyObject_RichCompare(a, b, Py_LE))
+    BINARY(OP_GTE, PyObject_RichCompare(a, b, Py_GE))
+    LOGICAL(OP_AND, &&)
+    LOGICAL(OP_OR, ||)
+
+    TARGET(OP_NEG) {
+        PyObject *a = POP();
+        PyObject *r = PyNumber_Negative(a);
+        Py_DECREF(a);
+        if (r == NULL) {
+            goto error;
+        }
+        PUSH(r);
+        DISPATCH();
+    }
+
+    TARGET(OP_JMP) {
+        Py_ssize_t offset = JUMP_ARG();
+        ip += offset;
+        DISPATCH();
+    }
+
+    TARGET(OP_JZ) {
+        Py_ssize_t offset = JUMP_ARG();
+        PyObject *v = POP();
+        int truth = PyObject_IsTrue(v);
+        Py_DECREF(v);
+        if (truth < 0) {
+            goto error;
+        }
+        if (!truth) {
+            ip += offset;
+        }
+        DISPATCH();
+    }
+
+    TARGET(OP_CALL) {
+        Py_ssize_t n = ARG();
+        PyObject **argv = sp - n;
+        PyObject *callee = argv[-1];
+        PyObject *r;
+        if (PyObject_TypeCheck(callee, (PyTypeObject *)st->code_type)) {
+            r = execute(callee, argv, n, st);
+        }
+        else {
+            r = PyObject_Vectorcall(callee, argv, n, NULL);
+        }
+        while (sp > argv - 1) {
+            PyObject *v = POP();
+            Py_DECREF(v);
+        }
+        if (r == NULL) {
+            goto error;
+        }
+        PUSH(r);
+        DISPATCH();
+    }
+
+    TARGET(OP_RET) {
+        result = POP();
+        goto exit;
+    }
+
+    TARGET(OP_POP) {
+        PyObject *v = POP();
+        Py_DECREF(v);
+        DISPATCH();
+    }
+
+#ifndef USE_COMPUTED_GOTO
+    default:
+        goto bad_opcode;
+    }
+#endif
+
+bad_opcode:
+    PyErr_Format(PyExc_SystemError, "unknown opcode %d", ip[-1]);
+error:
+    result = NULL;
+exit:
+    if (stack != NULL) {
+        while (sp > stack) {
+            PyObject *v = POP();
+            Py_DECREF(v);
+        }
+        PyMem_Free(stack);
+    }
+    if (locals != NULL) {
+        for (i = 0; i < nlocals; i++) {
+            Py_XDECREF(locals[i]);
+        }
+        PyMem_Free(locals);
+    }
+    Py_XDECREF(code);
+    Py_XDECREF(consts);
+    Py_LeaveRecursiveCall();
+    return result;
+}
+
+static PyObject *
+vm_run(PyObject *module, PyObject *args)
+{
+    PyObject *code_obj;
+    VMState st;
+
+    if (!PyArg_ParseTuple(args, "OO!OO:run", &code_obj, &PyList_Type, &st.globals,
+                          &st.code_type, &st.undefined)) {
+        return NULL;
+    }
+    if (!PyType_Check(st.code_type)) {
+        PyErr_SetString(PyExc_TypeError, "code_type must be a type");
+        return NULL;
+    }
+    return execute(code_obj, NULL, 0, &st);
+}
+
+static PyMethodDef vm_methods[] = {
+    {"run", vm_run, METH_VARARGS,
+     "run(code_object, globals, code_type, undefined) -> value\n\n"
+     "Execute a top-level code object; globals is the list of global slots."},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef vm_module = {
+    PyModuleDef_HEAD_INIT,
+    "minipy_vm",
+    "Threaded-dispatch MiniPython bytecode interpreter",
+    -1,
+    vm_methods,
+};
+
+PyMODINIT_FUNC
+PyInit_minipy_vm(void)
+{
+    return PyModule_Create(&vm_module);
+}
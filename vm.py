@@ -0,0 +1,23 @@
+"""Run compiled MiniPython programs.
+
+Uses the minipy_vm C extension (vm.c, built with `python setup.py
+build_ext --inplace`) when it is available and the pure-Python
+interpreter in vm_py otherwise.
+"""
+from bytecode import CodeObject
+from vm_py import BUILTINS, UNDEFINED, execute
+
+try:
+    import minipy_vm
+except ImportError:
+    minipy_vm = None
+
+
+def run(code_object: CodeObject, builtins=None):
+    """Execute a top-level code object and return its result"""
+    if builtins is None:
+        builtins = BUILTINS
+    globals = [builtins.get(name, UNDEFINED) for name in code_object.global_names]
+    if minipy_vm is not None:
+        return minipy_vm.run(code_object, globals, CodeObject, UNDEFINED)
+    return execute(code_object, [], globals)
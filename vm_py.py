@@ -0,0 +1,112 @@
+"""Pure-Python bytecode interpreter (fallback for the minipy_vm extension).
+
+A `while` loop over the code bytes; binary operators are dispatched
+through a dict of operator functions. Semantics match vm.c exactly.
+"""
+import operator
+
+from bytecode import CodeObject, OpCode
+
+BUILTINS = {
+    'print': print,
+}
+
+
+class _Undefined:
+    """Marker stored in global slots that were never assigned"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<undefined>"
+
+
+UNDEFINED = _Undefined()
+
+BINARY_HANDLERS = {
+    OpCode.ADD: operator.add,
+    OpCode.SUB: operator.sub,
+    OpCode.MUL: operator.mul,
+    OpCode.DIV: operator.truediv,
+    OpCode.EQ: operator.eq,
+    OpCode.NEQ: operator.ne,
+    OpCode.LT: operator.lt,
+    OpCode.GT: operator.gt,
+    OpCode.LTE: operator.le,
+    OpCode.GTE: operator.ge,
+    OpCode.AND: lambda a, b: bool(a) and bool(b),
+    OpCode.OR: lambda a, b: bool(a) or bool(b),
+}
+
+
+def execute(code_object: CodeObject, args, globals):
+    """Run one code object with the given arguments; returns its result"""
+    if len(args) != code_object.nparams:
+        raise TypeError(f"{code_object.name}() takes {code_object.nparams} "
+                        f"arguments ({len(args)} given)")
+
+    code = code_object.code
+    consts = code_object.consts
+    locals = list(args) + [UNDEFINED] * (code_object.nlocals - len(args))
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    binary = BINARY_HANDLERS
+    ip = 0
+
+    while True:
+        op = code[ip]
+        if op in binary:
+            ip += 1
+            b = pop()
+            push(binary[op](pop(), b))
+            continue
+        if op == OpCode.RET:
+            return pop()
+        if op == OpCode.POP:
+            pop()
+            ip += 1
+            continue
+        if op == OpCode.NEG:
+            push(-pop())
+            ip += 1
+            continue
+
+        arg = code[ip + 1] | (code[ip + 2] << 8)
+        if op == OpCode.CONST:
+            push(consts[arg])
+            ip += 3
+        elif op == OpCode.LOAD:
+            value = locals[arg]
+            if value is UNDEFINED:
+                raise NameError("local variable referenced before assignment")
+            push(value)
+            ip += 3
+        elif op == OpCode.STORE:
+            locals[arg] = pop()
+            ip += 3
+        elif op == OpCode.LOAD_GLOBAL:
+            value = globals[arg]
+            if value is UNDEFINED:
+                raise NameError(f"name '{code_object.global_names[arg]}' is not defined")
+            push(value)
+            ip += 3
+        elif op == OpCode.STORE_GLOBAL:
+            globals[arg] = pop()
+            ip += 3
+        elif op == OpCode.JMP:
+            ip += 3 + (arg - 0x10000 if arg & 0x8000 else arg)
+        elif op == OpCode.JZ:
+            ip += 3
+            if not pop():
+                ip += arg - 0x10000 if arg & 0x8000 else arg
+        elif op == OpCode.CALL:
+            ip += 3
+            call_args = stack[len(stack) - arg:]
+            del stack[len(stack) - arg:]
+            callee = pop()
+            if isinstance(callee, CodeObject):
+                push(execute(callee, call_args, globals))
+            else:
+                push(callee(*call_args))
+        else:
+            raise SystemError(f"unknown opcode {op}")